@@ -0,0 +1,213 @@
+"""Time the solver and the dictionary import on the real puzzle archive.
+
+Each phase is timed on its own: reading the dictionary, building the
+trie, compiling and mapping the lexicon, the word search, the pair
+search and the formatting for every archived box, and the import of a
+day's words. If NumPy is installed, the word search of letterboxed_vector
+is timed on the same boxes, as vector_word_search. The results are written as JSON with percentiles, and can
+be saved as a baseline or compared against one.
+
+    python benchmark.py --dictionary daily_dictionaries.txt
+        --solutions letterboxed_solutions.txt --output bench.json
+        --baseline baseline.json --tolerance 0.2
+
+The import is timed against fixtures. With --fixtures, each *.json file
+in the directory is a saved copy of a day's window.gameData. Otherwise
+fixtures are rebuilt from the archive: for each day, the words the
+solver finds for its box among the words known by then, imported into
+a copy of the dictionary as it was the day before."""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from math import ceil
+from statistics import mean
+
+from import_requests import import_metadata, parse_metadata
+from letterboxed import (Solver, dictionary_file, find_pairs, format_pairs,
+                         solution_file)
+from letterboxed_lexicon import Trie, load_lexicon, load_words
+from solution_store import SolutionStore
+
+try:
+    import letterboxed_vector
+except ImportError:  # NumPy is not installed.
+    letterboxed_vector = None
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_times: list[float], pct: int) -> float:
+    """The pct percentile of sorted times, by the nearest rank."""
+    rank = max(0, ceil(pct / 100 * len(sorted_times)) - 1)
+    return sorted_times[rank]
+
+
+def summarize(times: list[float]) -> dict:
+    """Count, mean, min, max and percentiles of the times, in milliseconds."""
+    ordered = sorted(t * 1000 for t in times)
+    summary = {'n': len(ordered), 'mean_ms': mean(ordered),
+               'min_ms': ordered[0], 'max_ms': ordered[-1]}
+    for pct in PERCENTILES:
+        summary[f'p{pct}_ms'] = percentile(ordered, pct)
+    return summary
+
+
+def timed(function, *args):
+    """Call the function and return its result and how long it took."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_startup(the_file: str, repeat: int, work_dir: str) -> dict:
+    """Time reading the dictionary and building the lexicons."""
+    times = {'dictionary_load': [], 'trie_build': [],
+             'lexicon_compile': [], 'lexicon_load': []}
+    for i in range(repeat):
+        words, elapsed = timed(load_words, the_file)
+        times['dictionary_load'].append(elapsed)
+        times['trie_build'].append(timed(Trie, words)[1])
+        cache_dir = os.path.join(work_dir, f"lexicon{i}")
+        times['lexicon_compile'].append(timed(load_lexicon, the_file, cache_dir)[1])
+        times['lexicon_load'].append(timed(load_lexicon, the_file, cache_dir)[1])
+    return times
+
+
+def bench_solves(solver: Solver, boxes: list[list[str]], repeat: int,
+                 encoded=None) -> dict:
+    """Time the word search, pair search and formatting for each box,
+       and the NumPy word search if given the encoded words."""
+    times = {'word_search': [], 'vector_word_search': [], 'pair_search': [],
+             'formatting': []}
+    for _ in range(repeat):
+        for box in boxes:
+            words, elapsed = timed(solver.find_words, box)
+            times['word_search'].append(elapsed)
+            if encoded is not None:
+                times['vector_word_search'].append(
+                    timed(letterboxed_vector.find_words, box, encoded)[1])
+            words.sort()
+            pairs, elapsed = timed(find_pairs, words)
+            times['pair_search'].append(elapsed)
+            pairs.sort(key=lambda x: len(''.join(x)))
+            times['formatting'].append(timed(format_pairs, pairs)[1])
+    return times
+
+
+def read_dated_lines(the_file: str) -> list[tuple[str, str, str]]:
+    """Return (word, date, line) for each line of the dictionary."""
+    with open(the_file, 'r', encoding='UTF-8', newline='') as file:
+        return [(line.split('\t')[0], line.split('\t')[1].strip(), line)
+                for line in file if '\t' in line]
+
+
+def archive_fixtures(the_file: str, store: SolutionStore,
+                     count: int) -> list[dict]:
+    """Rebuild the game data of the latest days from the archive."""
+    dated = read_dated_lines(the_file)
+    fixtures = []
+    for record in sorted(store.records, key=lambda r: r['date'])[-count:]:
+        known = Trie(word for word, date, _ in dated if date <= record['date'])
+        fixtures.append({'printDate': record['date'],
+                         'sides': record['sides'],
+                         'ourSolution': record['solution'],
+                         'dictionary': Solver(known).find_words(record['sides'])})
+    return fixtures
+
+
+def saved_fixtures(fixture_dir: str) -> list[dict]:
+    """Read the saved game data captures in a directory."""
+    fixtures = []
+    for name in sorted(os.listdir(fixture_dir)):
+        if name.endswith('.json'):
+            with open(os.path.join(fixture_dir, name), 'r', encoding='UTF-8') as file:
+                fixtures.append(json.load(file))
+    return fixtures
+
+
+def bench_import(the_file: str, fixtures: list[dict], work_dir: str) -> dict:
+    """Time importing each fixture into the dictionary as it was before."""
+    dated = read_dated_lines(the_file)
+    times = {'import': []}
+    for fixture in fixtures:
+        day = fixture['printDate']
+        copy = os.path.join(work_dir, f"dictionary-{day}.txt")
+        with open(copy, 'w', encoding='UTF-8', newline='') as file:
+            file.writelines(line for _, date, line in dated if date < day)
+        times['import'].append(
+            timed(import_metadata, parse_metadata(fixture), copy)[1])
+        os.remove(copy)
+    return times
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return a line for each phase whose median is slower than the
+       baseline's by more than the tolerance."""
+    regressions = []
+    for phase, summary in results['phases'].items():
+        before = baseline.get('phases', {}).get(phase)
+        if before is None:
+            continue
+        if summary['p50_ms'] > before['p50_ms'] * (1 + tolerance):
+            regressions.append(
+                f"{phase}: p50 {summary['p50_ms']:.3f} ms, "
+                f"baseline {before['p50_ms']:.3f} ms")
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Run the benchmarks. Return 1 if a phase regressed."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dictionary', default=dictionary_file)
+    parser.add_argument('--solutions', default=solution_file)
+    parser.add_argument('--boxes', type=int, help="Only the first N boxes")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--fixtures', help="Directory of saved game data")
+    parser.add_argument('--import-days', type=int, default=10,
+                        help="Days rebuilt from the archive without --fixtures")
+    parser.add_argument('--output', help="JSON results file, stdout if not given")
+    parser.add_argument('--baseline', help="Compare against this results file")
+    parser.add_argument('--save-baseline', help="Also save the results here")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed slow down of a median, 0.2 is 20%%")
+    args = parser.parse_args(argv)
+
+    store = SolutionStore(args.solutions)
+    boxes = [record['sides'] for record in store.records][:args.boxes]
+    with tempfile.TemporaryDirectory() as work_dir:
+        times = bench_startup(args.dictionary, args.repeat, work_dir)
+        solver = Solver(load_lexicon(args.dictionary, work_dir))
+        encoded = (None if letterboxed_vector is None else
+                   letterboxed_vector.EncodedWords(load_words(args.dictionary)))
+        times.update(bench_solves(solver, boxes, args.repeat, encoded))
+        fixtures = (saved_fixtures(args.fixtures) if args.fixtures else
+                    archive_fixtures(args.dictionary, store, args.import_days))
+        times.update(bench_import(args.dictionary, fixtures, work_dir))
+        solver.lexicon.close()
+
+    results = {'python': sys.version.split()[0],
+               'boxes': len(boxes),
+               'repeat': args.repeat,
+               'phases': {phase: summarize(phase_times)
+                          for phase, phase_times in times.items() if phase_times}}
+    text = json.dumps(results, indent=2)
+    for the_file in (args.output, args.save_baseline):
+        if the_file:
+            with open(the_file, 'w', encoding='UTF-8') as file:
+                file.write(text + '\n')
+    if not args.output:
+        print(text)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='UTF-8') as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for line in regressions:
+            print(f"Slower: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,50 +1,93 @@
-'''This module provides functions to encrypt and decrypt a file using a Caesar cipher.'''
+'''This module provides functions to encrypt and decrypt a file using a Caesar cipher.
+
+The letters are shifted with str.translate and a table made once for each
+key, and files are read in chunks. The read functions decrypt into memory,
+or line by line, without changing the file.'''
 import random
+import string
+from functools import lru_cache
+
+CHUNK_SIZE = 1 << 16  # Characters read from the file at a time.
+
+@lru_cache(maxsize=26)
+def shift_table(key):
+    '''Return the translation table that shifts each letter by the key,
+       wrapping around from z to a. Capitals become small letters.'''
+    key %= 26
+    shifted = string.ascii_lowercase[key:] + string.ascii_lowercase[:key]
+    return str.maketrans(string.ascii_lowercase + string.ascii_uppercase,
+                         shifted + shifted)
+
+def shift_line(line, key):
+    '''Shift each letter in a line by the key, wrapping around from z to a.'''
+    return line.translate(shift_table(key))
+
+def read_key(first_line):
+    '''Return the key from the first line of a file, None if it is not a key.'''
+    try:
+        return int(first_line)
+    except ValueError:
+        return None
+
+def iter_decrypted_chunks(file_path, chunk_size=CHUNK_SIZE):
+    '''Yield the decrypted text of a file a chunk at a time,
+       leaving the file as it is. A file that is not encrypted is
+       yielded as it is.'''
+    with open(file_path, 'r', encoding='utf-8') as ifile:
+        first_line = ifile.readline()
+        key = read_key(first_line)  # The first line is the key
+        if key is None:
+            yield first_line
+            table = None
+        else:
+            table = shift_table(-key)
+        for chunk in iter(lambda: ifile.read(chunk_size), ''):
+            yield chunk if table is None else chunk.translate(table)
+
+def iter_decrypted_lines(file_path, chunk_size=CHUNK_SIZE):
+    '''Yield the decrypted lines of a file, leaving the file as it is.'''
+    pending = ''
+    for chunk in iter_decrypted_chunks(file_path, chunk_size):
+        lines = (pending + chunk).split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line + '\n'
+    if pending:
+        yield pending
+
+def read_decrypted(file_path):
+    '''Return the decrypted text of a file, leaving the file as it is.'''
+    return ''.join(iter_decrypted_chunks(file_path))
+
+def decrypt_lines(file_path):
+    '''Return the decrypted lines of a file without changing the file.'''
+    return list(iter_decrypted_lines(file_path))
 
 def encrypt_file(file_path):
     '''Encrypts a file using a random shift for a Caesar cipher.
        The shift is stored as the first line of the file.'''
     key = random.randint(1, 25)  # Generate a random shift key between 1 and 25
-    encrypted_lines = [f"{key}\n"]  # Store the key as the first line
+    table = shift_table(key)
+    encrypted_chunks = [f"{key}\n"]  # Store the key as the first line
 
     with open(file_path, 'r', encoding='utf-8') as ifile:
-        for line in ifile:
-            if line.strip().isdigit():
-                return  # Exit if the first line is the key, its already encrypted.
-            encrypted_line = ''
-            for char in line:
-                if char.isalpha():
-                    # This works only for a text file with English letters.
-                    encrypted_char = chr((ord(char.lower()) - ord('a') + key) % 26 + ord('a'))
-                    encrypted_line += encrypted_char
-                else:
-                    encrypted_line += char
-            encrypted_lines.append(encrypted_line)
+        first_line = ifile.readline()
+        if first_line.strip().isdigit():
+            return  # Exit if the first line is the key, its already encrypted.
+        encrypted_chunks.append(first_line.translate(table))
+        for chunk in iter(lambda: ifile.read(CHUNK_SIZE), ''):
+            encrypted_chunks.append(chunk.translate(table))
 
     with open(file_path, 'w', encoding='utf-8') as ofile:
-        ofile.writelines(encrypted_lines)
+        ofile.writelines(encrypted_chunks)
 
 def decrypt_file(file_path):
     '''Decrypts a file that was encrypted using the encrypt_file function.'''
     with open(file_path, 'r', encoding='utf-8') as ifile:
-        lines = ifile.readlines()
-
-    try:
-        key = int(lines[0])  # The first line is the key
-    except ValueError:       # If the first line is not a number, the file
-        return               # is not encrypted, so don't do anything
-
-    decrypted_lines = []
-
-    for line in lines[1:]:  # Skip the first line which is the key
-        decrypted_line = ''
-        for char in line:
-            if char.isalpha():
-                decrypted_char = chr((ord(char.lower()) - ord('a') - key + 26) % 26 + ord('a'))
-                decrypted_line += decrypted_char
-            else:
-                decrypted_line += char
-        decrypted_lines.append(decrypted_line)
+        if read_key(ifile.readline()) is None:  # If the first line is not a
+            return                              # number, the file is not
+                                                # encrypted, so don't do anything
+    decrypted_text = read_decrypted(file_path)
 
     with open(file_path, 'w', encoding='utf-8') as ofile:
-        ofile.writelines(decrypted_lines)
+        ofile.write(decrypted_text)
@@ -0,0 +1,138 @@
+"""Import many Letter Boxed puzzles at once, from saved pages or URLs.
+
+    python import_backfill.py captures/ 2025-01-20.html
+        https://example.com/letter-boxed/2025-01-19 --urls-file urls.txt
+
+A source is a directory of captures, a capture file or a URL. A capture
+is a saved puzzle page (.html or .htm) or its game data saved as .json.
+The sources are read at the same time, URLs through one session that
+keeps its connections open and retries. Then the words of all the days
+are merged into the dictionary in one pass, each word with the first day
+it was seen, and the solutions of the new days are appended in one write.
+A source that can't be read is reported and the rest are imported."""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from import_requests import (PATH, POOL_SIZE, RETRIES, extract_game_data,
+                             fetch_game_data, make_session, merge_dated_words,
+                             parse_metadata)
+from solution_store import SolutionStore
+
+CAPTURE_TYPES = ('.html', '.htm', '.json')
+WORKERS = POOL_SIZE
+
+
+def is_url(source: str) -> bool:
+    """Whether the source is a URL rather than a file."""
+    return source.startswith(('http://', 'https://'))
+
+
+def expand_sources(sources: list[str]) -> list[str]:
+    """Replace each directory with the captures in it, in name order."""
+    expanded = []
+    for source in sources:
+        if not is_url(source) and os.path.isdir(source):
+            expanded.extend(os.path.join(source, name)
+                            for name in sorted(os.listdir(source))
+                            if name.lower().endswith(CAPTURE_TYPES))
+        else:
+            expanded.append(source)
+    return expanded
+
+
+def read_capture(the_file: str) -> dict:
+    """Return the game data in a saved page or JSON capture."""
+    with open(the_file, 'r', encoding='UTF-8') as file:
+        text = file.read()
+    if the_file.lower().endswith('.json'):
+        return json.loads(text)
+    return extract_game_data(text)
+
+
+def read_source(source: str, session) -> dict:
+    """Return the game data of a capture file or URL."""
+    return fetch_game_data(source, session) if is_url(source) else read_capture(source)
+
+
+def collect_metadata(sources: list[str], session, workers: int = WORKERS
+                     ) -> tuple[list[tuple], list[tuple[str, Exception]]]:
+    """Read the sources at the same time. Return the metadata of each
+       source that could be read, as from parse_metadata, and the others
+       with their errors."""
+    def attempt(source):
+        try:
+            return source, parse_metadata(read_source(source, session)), None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            return source, None, e
+
+    metadata, failures = [], []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for source, day, error in pool.map(attempt, sources):
+            if error is None:
+                metadata.append(day)
+            else:
+                failures.append((source, error))
+    return metadata, failures
+
+
+def backfill(metadata: list[tuple], dictionary: str,
+             solution_file: str) -> dict:
+    """Merge the days' words into the dictionary, each with the first day
+       it was seen, and append the new days' solutions. Return counts."""
+    first_seen: dict[str, str] = {}
+    days = []
+    for words, _, letterbox_date, solution, sides in metadata:
+        for word in words:
+            if word not in first_seen or letterbox_date < first_seen[word]:
+                first_seen[word] = letterbox_date
+        days.append((letterbox_date, solution, sides,
+                     ''.join(sorted(set(''.join(sides))))))
+    added, redated, total = merge_dated_words(dictionary, first_seen)
+    solutions_added = SolutionStore(solution_file).extend(days)
+    return {'days': len({day[0] for day in days}),
+            'words_seen': len(first_seen),
+            'words_added': added,
+            'words_redated': redated,
+            'total_words': total,
+            'solutions_added': solutions_added}
+
+
+def main(argv=None) -> int:
+    """Import the sources. Return 1 if any could not be read."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sources', nargs='*',
+                        help="Capture directories, capture files or URLs")
+    parser.add_argument('--urls-file', help="A file with a URL on each line")
+    parser.add_argument('--dictionary',
+                        default=os.path.join(PATH, "daily_dictionaries.txt"))
+    parser.add_argument('--solutions',
+                        default=os.path.join(PATH, "letterboxed_solutions.txt"))
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--retries', type=int, default=RETRIES)
+    args = parser.parse_args(argv)
+
+    sources = expand_sources(args.sources)
+    if args.urls_file:
+        with open(args.urls_file, 'r', encoding='UTF-8') as file:
+            sources.extend(line.strip() for line in file
+                           if line.strip() and not line.startswith('#'))
+    if not sources:
+        parser.error("no sources to import")
+    with make_session(args.retries, args.workers) as session:
+        metadata, failures = collect_metadata(sources, session, args.workers)
+    for source, error in failures:
+        print(f"Could not read {source}: {error}", file=sys.stderr)
+    if metadata:
+        counts = backfill(metadata, args.dictionary, args.solutions)
+        print(f"{counts['days']} days. {counts['words_added']:,d} words added, "
+              f"{counts['words_redated']:,d} given an earlier date. "
+              f"Now {counts['total_words']:,d} words in the dictionary. "
+              f"{counts['solutions_added']} solutions added.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
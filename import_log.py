@@ -0,0 +1,156 @@
+"""The import log, one JSON record per line, appended to and never rewritten.
+
+Each import adds a line with the puzzle date, the words added, the words
+already there, the total and how long the import took. A record is
+written with one append, so importers on the shared Data path don't
+overwrite each other. When the file grows past its size limit it is
+rotated to .1, .2 and so on, under a lock file so only one importer
+rotates it. tail reads the newest records from the end of the files
+without reading the rest."""
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+
+MAX_BYTES = 256 * 1024  # Size at which the log is rotated.
+BACKUPS = 3             # Rotated files kept.
+BLOCK_SIZE = 8192       # Bytes read at a time from the end of a file.
+LOCK_TIMEOUT = 10.0     # Seconds to wait for the rotation lock.
+STALE_LOCK = 60.0       # Seconds after which a lock is taken to be left over.
+
+# A line of the old text log, which had the newest line at the top.
+LEGACY_LINE = re.compile(r"(\S+) ([\d,]+) words added\. ([\d,]+) words were "
+                         r"already there\. Now ([\d,]+) words in the dictionary\.")
+
+
+def make_record(letterbox_date: str, words_added: int, already_present: int,
+                total_words: int, duration: float) -> dict:
+    """A record of one day's import."""
+    return {'date': letterbox_date,
+            'words_added': words_added,
+            'already_present': already_present,
+            'total_words': total_words,
+            'duration_s': round(duration, 3)}
+
+
+def legacy_records(the_file: str) -> list[dict]:
+    """The records in an old text log, oldest first. It has no durations."""
+    records = []
+    with open(the_file, 'r', encoding='UTF-8') as file:
+        for line in file:
+            match = LEGACY_LINE.match(line.strip())
+            if match:
+                added, present, total = (int(n.replace(',', ''))
+                                         for n in match.groups()[1:])
+                records.append({**make_record(match[1], added, present, total, 0),
+                                'duration_s': None})
+    return records[::-1]
+
+
+@contextmanager
+def rotation_lock(the_file: str):
+    """Hold the lock file for rotating the log. A lock older than
+       STALE_LOCK is from an importer that stopped, so it is removed."""
+    lock_file = f"{the_file}.lock"
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while True:
+        try:
+            os.close(os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_file) > STALE_LOCK:
+                    os.remove(lock_file)
+                    continue
+            except OSError:
+                continue  # Released while we looked.
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{lock_file} is held by another importer")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        try:
+            os.remove(lock_file)
+        except OSError:
+            pass
+
+
+def rotate(the_file: str, max_bytes: int = MAX_BYTES,
+           backups: int = BACKUPS) -> None:
+    """Move the log to .1, .1 to .2 and so on, dropping the oldest, if it
+       is still over the limit once the lock is held."""
+    with rotation_lock(the_file):
+        try:
+            if os.path.getsize(the_file) < max_bytes:
+                return  # Another importer rotated it first.
+        except FileNotFoundError:
+            return
+        for number in range(backups - 1, 0, -1):
+            older = f"{the_file}.{number}"
+            if os.path.exists(older):
+                os.replace(older, f"{the_file}.{number + 1}")
+        if backups > 0:
+            os.replace(the_file, f"{the_file}.1")
+        else:
+            os.remove(the_file)
+
+
+def append_record(the_file: str, record: dict, max_bytes: int = MAX_BYTES,
+                  backups: int = BACKUPS) -> None:
+    """Append a record to the log, rotating it first if it is full."""
+    line = (json.dumps(record, separators=(',', ':')) + '\n').encode('UTF-8')
+    try:
+        if os.path.getsize(the_file) + len(line) > max_bytes:
+            rotate(the_file, max_bytes, backups)
+    except FileNotFoundError:
+        pass
+    descriptor = os.open(the_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(descriptor, line)
+    finally:
+        os.close(descriptor)
+
+
+def iter_lines_backwards(the_file: str):
+    """Yield the lines of a file from the last to the first."""
+    with open(the_file, 'rb') as file:
+        position = file.seek(0, os.SEEK_END)
+        pending = b''
+        while position > 0:
+            size = min(BLOCK_SIZE, position)
+            position -= size
+            file.seek(position)
+            lines = (file.read(size) + pending).split(b'\n')
+            pending = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if pending.strip():
+            yield pending
+
+
+def tail(the_file: str, count: int, backups: int = BACKUPS) -> list[dict]:
+    """Return the newest count records, newest first, going on into the
+       rotated files if the log has fewer."""
+    records = []
+    for name in [the_file] + [f"{the_file}.{n}" for n in range(1, backups + 1)]:
+        if not os.path.exists(name):
+            continue
+        for line in iter_lines_backwards(name):
+            if len(records) == count:
+                return records
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # A line cut short by a crash.
+    return records[:count]
+
+
+if __name__ == "__main__":
+    import sys
+    from import_requests import PATH
+    for entry in tail(os.path.join(PATH, "import_requests.jsonl"),
+                      int(sys.argv[1]) if len(sys.argv) > 1 else 10):
+        print(json.dumps(entry))
@@ -3,8 +3,14 @@
 import sys
 import os
 import json
+import time
+import hashlib
 import requests
-from encrypt import decrypt_file, encrypt_file
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from import_log import append_record, legacy_records, make_record
+from solution_store import SolutionStore
+from word_features import features_path, write_features
 
 def resource_path(relative_path):
     """ Get absolute path to resource """
@@ -14,61 +20,158 @@ def resource_path(relative_path):
 # Where the files are stored
 PATH = resource_path("Data")
 
-def sort_inplace(the_file: str) -> None:
-    """Sorts the lines in a file in place."""
-    with open(the_file, 'r', encoding='UTF-8') as ifile:
-        lines = ifile.readlines()
-    lines.sort()
-    with open(the_file, 'w', encoding='UTF-8') as ofile:
-        ofile.writelines(lines)
+GAME_DATA = "window.gameData"
+TIMEOUT = 10            # Seconds to wait for the server.
+RETRIES = 3             # Times a failed request is tried again.
+BACKOFF = 0.5           # Seconds before the first retry, doubling each time.
+POOL_SIZE = 8           # Connections kept open to each host.
 
-def fetch_todays_metadata(url: str) -> tuple[list[str], int, str, list[str]]:
+def make_session(retries: int = RETRIES, pool_size: int = POOL_SIZE) -> requests.Session:
+    """A session that keeps its connections open and tries failed
+        requests again, waiting longer each time."""
+    retry = Retry(total=retries, backoff_factor=BACKOFF,
+                  status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET",))
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size,
+                          pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def extract_game_data(page: str) -> dict:
+    """Decode the game data object that follows window.gameData in a
+        puzzle page, in one pass from its opening brace to its end."""
+    data_start = page.find(GAME_DATA)
+    if data_start < 0:
+        raise ValueError(f"the page has no {GAME_DATA}")
+    game_data, _ = json.JSONDecoder().raw_decode(page, page.index("{", data_start))
+    return game_data
+
+def fetch_game_data(url: str, session: requests.Session | None = None) -> dict:
+    """Fetch a puzzle page and return its game data."""
+    response = (session or requests).get(url, timeout=TIMEOUT)
+    response.raise_for_status()
+    return extract_game_data(response.text)
+
+def fetch_todays_metadata(url: str, session: requests.Session | None = None
+                          ) -> tuple[list[str], int, str, list[str]]:
     """Fetches today's words for the NYT Letter Boxed puzzle."""
-    response = requests.get(url, timeout=10)
-    data_start = response.text.index("window.gameData")
-    metadata_start = data_start + response.text[data_start:].index("{")
-    metadata_end = metadata_start + response.text[metadata_start:].index("}")
-    metadata = json.loads(response.text[metadata_start:metadata_end + 1])
+    return parse_metadata(fetch_game_data(url, session))
+
+def parse_metadata(metadata: dict) -> tuple[list[str], int, str, list[str], list[str]]:
+    """Pick the words, word count, date, solution and sides
+        out of the puzzle's game data."""
     return ([word.lower() for word in metadata['dictionary']],
             len(metadata['dictionary']),
             metadata['printDate'],
             metadata['ourSolution'],
             metadata['sides'])
 
-def load_the_dictionary(dictionary) -> tuple[int, set]:
-    """Read the file and store the words in a set
-        after removing the timestamps. Return the set."""
-    existing_words = set()
-    with open(dictionary, 'r', encoding='UTF-8') as file:
-        for line in file:
-            word, _ = line.strip().split('\t')
-            existing_words.add(word)
-        return existing_words
+def merge_new_words(dictionary: str, new_words: list[str],
+                    letterbox_date: str) -> tuple[int, int]:
+    """Merge the words that are not in the sorted dictionary into it,
+        with the date. Return the number of words added and the new total."""
+    added, _, total = merge_dated_words(
+        dictionary, dict.fromkeys(new_words, letterbox_date))
+    return added, total
+
+def merge_dated_words(dictionary: str,
+                      dated_words: dict[str, str]) -> tuple[int, int, int]:
+    """Merge words, each with the date it was first seen, into the
+        sorted dictionary. A word that is already there keeps the earlier
+        of the two dates. Both are sorted, so one pass over the file finds
+        which words are new and where they go. The merge is written to
+        a temporary file that then replaces the dictionary, so an
+        interrupted import leaves the old dictionary whole. The features
+        of the words are written beside it from the same pass.
+        Return the number of words added, the number given an earlier
+        date and the new total."""
+    new_words = sorted(dated_words)
+    next_new = 0
+    added = 0
+    redated = 0
+    total = 0
+    end_of_line = '\n'
+    temp_file = f"{dictionary}.{os.getpid()}.tmp"
+    words = []
+    digest = hashlib.sha256()
+    size = 0
+
+    def write(line: str) -> None:
+        """Write a line of the merged dictionary, noting its word."""
+        nonlocal size
+        ofile.write(line)
+        data = line.encode('UTF-8')
+        digest.update(data)
+        size += len(data)
+        word = line.partition('\t')[0].strip()
+        if word:
+            words.append(word)
+
+    def insert_before(word: str | None) -> str | None:
+        """Write the new words that sort before the word. If the word is
+            one of the new words skip it and return its new date."""
+        nonlocal next_new, added
+        while next_new < len(new_words) and (
+                word is None or new_words[next_new] < word):
+            new_word = new_words[next_new]
+            write(f"{new_word}\t{dated_words[new_word]}{end_of_line}")
+            next_new += 1
+            added += 1
+        if next_new < len(new_words) and new_words[next_new] == word:
+            next_new += 1
+            return dated_words[word]
+        return None
+
+    try:
+        with open(dictionary, 'r', encoding='UTF-8', newline='') as ifile, \
+                open(temp_file, 'w', encoding='UTF-8', newline='') as ofile:
+            for line in ifile:
+                if line.endswith('\r\n'):
+                    end_of_line = '\r\n'
+                elif not line.endswith('\n'):
+                    line += end_of_line
+                word, _, date = line.partition('\t')
+                new_date = insert_before(word)
+                if new_date is not None and new_date < date.rstrip('\r\n'):
+                    line = f"{word}\t{new_date}{end_of_line}"
+                    redated += 1
+                write(line)
+                total += 1
+            insert_before(None)
+        os.replace(temp_file, dictionary)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+    # The features can be made again and a stale file is never used, so
+    # failing to write them doesn't fail the import.
+    try:
+        write_features(features_path(dictionary), words, (size, digest.digest()))
+    except OSError as e:
+        print(f"Could not write the word features: {e}", file=sys.stderr)
+    return added, redated, total + added
 
 def append_new_words(url: str, dictionary: str) -> tuple[
         int, int, int, str, list[str, str], list[str, str, str, str], str]:
     """Append new words to the file, with a time stamp.
         Return numbers for logging."""
-    metadata = fetch_todays_metadata(url)
+    return import_metadata(fetch_todays_metadata(url), dictionary)
+
+def import_metadata(metadata: tuple, dictionary: str) -> tuple[
+        int, int, int, str, list[str, str], list[str, str, str, str], str]:
+    """Add the words of a day's metadata, as returned by
+        fetch_todays_metadata, to the dictionary. Return numbers for logging."""
     new_words: int = sorted(metadata[0])
     metadata_word_count: int = metadata[1]
     letterbox_date: str = metadata[2]
     solution: list[str, str] = metadata[3]
     sides: list[str, str, str, str] = metadata[4]
     signature: str = ''.join(sorted(set(''.join(sides))))
-    new_word_count = 0
-    existing_words = sorted(load_the_dictionary(dictionary))
-    with open(dictionary, 'a', encoding='UTF-8') as file:
-        new_word_count = 0
-        for word in new_words:
-            # If the word is not in the dictionary,
-            # append it with the current date and time
-            if word not in existing_words:
-                file.write(f"{word}\t{letterbox_date}\n")
-                new_word_count += 1
-    sort_inplace(dictionary)
+    new_word_count, total_words = merge_new_words(
+        dictionary, new_words, letterbox_date)
     return (new_word_count,
-            len(existing_words) + new_word_count,
+            total_words,
             metadata_word_count - new_word_count,
             letterbox_date,
             solution,
@@ -80,36 +183,24 @@ def main():
         appends them to a file, and logs the results."""
     # Facts
     dictionary_file = os.path.join(PATH, "daily_dictionaries.txt")
-    log_file = os.path.join(PATH, "import_requests.log")
+    log_file = os.path.join(PATH, "import_requests.jsonl")
+    legacy_log_file = os.path.join(PATH, "import_requests.log")
     solution_file = os.path.join(PATH, "letterboxed_solutions.txt")
     letter_box_url = "https://www.nytimes.com/puzzles/letter-boxed"
     # Action
+    start = time.perf_counter()
     word_counts = append_new_words(letter_box_url, dictionary_file)
-    # Save the solution to the top of the solutions file.
-    decrypt_file(solution_file)
-    with open(solution_file, 'r+', encoding='UTF-8') as file:
-        content = file.readlines()
-        letterbox_date = word_counts[3]
-        solution = word_counts[4]
-        sides = word_counts[5]
-        signature = word_counts[6]
-        file_line = f"{letterbox_date}*{solution}*{sides}*{signature}\n".lower()
-        content.insert(0, file_line.rstrip('\r\n') + '\n')
-        file.seek(0, 0)
-        file.writelines(content)
-    encrypt_file(solution_file)
-    # Save the log message to the top of the log file.
-    log_message = " ".join(f"{word_counts[3]} {word_counts[0]:4,d} words added. "
-                   f"{word_counts[2]:4,d} words were already there. "
-                   f"Now {word_counts[1]:7,d} words in the dictionary.\n".split())
-    with open(log_file, 'r+', encoding='UTF-8') as log:
-        content = log.readlines()
-        content.insert(0, log_message.rstrip('\r\n') + '\n')
-        # Trim the log file after 100 entries
-        content = content[:100]
-        log.seek(0, 0)
-        log.writelines(content)
-        log.truncate()
+    # Append the solution to the solutions file, once for each day.
+    SolutionStore(solution_file).append(
+        word_counts[3], word_counts[4], word_counts[5], word_counts[6])
+    # Start the new log with the entries of the old one.
+    if not os.path.exists(log_file) and os.path.exists(legacy_log_file):
+        for record in legacy_records(legacy_log_file):
+            append_record(log_file, record)
+    # Append the record of the import to the end of the log file.
+    append_record(log_file, make_record(
+        word_counts[3], word_counts[0], word_counts[2], word_counts[1],
+        time.perf_counter() - start))
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,32 @@
 """ find solutions for nyt "letter boxed" """
 import sys
 import os
-import ast
-from tempfile import gettempdir
+import queue
+import threading
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from copy import copy
+from functools import cache, partial, reduce
+from heapq import heapify, heappop, heappush
+from itertools import count as counter, product
+from math import inf
+from typing import TYPE_CHECKING, Iterator
+from operator import or_
 
-from tkinter import messagebox
-from letterboxed_forms import InputForm, OutputForm
-from encrypt import decrypt_file, encrypt_file
+from letterboxed_lexicon import CACHE_DIR, Lexicon, load_lexicon
+from result_cache import ResultCache
+from share_cache import ShareCache
+from single_instance import Instance, hand_off
+from word_features import features_path, load_features
+from solution_store import SolutionStore
+
+if TYPE_CHECKING:
+    # The forms need tkinter and a display, so they are only imported
+    # when the forms are shown.
+    from letterboxed_forms import OutputForm
+    from letterboxed_precompute import Precomputer
 
 PATH = "\\\\texas\\Public\\LetterBoxed"
 dictionary_file = os.path.join(PATH, "daily_dictionaries.txt")
@@ -14,57 +34,72 @@ solution_file = os.path.join(PATH, "letterboxed_solutions.txt")
 
 SIDES = 4
 LETTERS_ON_SIDE = 3
+MAX_WORDS = 4
+POLL_MS = 50  # How often the forms check for results from the worker.
 
-found_words = []
-dictionary = {}
-words_list = []
+class SolveStats:
+    """ Counts and timings from solving a box, to show why it is slow.
+        The counts are the letters tried after each prefix, the word
+        checks on the nodes found, the prefixes expanded in the search for
+        words, and the candidate words tried in the search for pairs. """
 
-LOCK_FILE_DIR = os.path.join(gettempdir(), "LetterBoxed")
-LOCK_FILE = os.path.join(LOCK_FILE_DIR, "#_lock_file_for_letterboxed_#.txt")
+    def __init__(self):
+        self.prefix_probes = 0
+        self.membership_checks = 0
+        self.nodes_expanded = 0
+        self.pair_comparisons = 0
+        self.word_count = 0
+        self.pair_count = 0
+        self.cached = False
+        self.phase_seconds: dict[str, float] = {}
 
-# Ensure the lock file directory exists
-os.makedirs(LOCK_FILE_DIR, exist_ok=True)
+    @contextmanager
+    def phase(self, name: str):
+        """ Add the time spent in the with block to the phase. """
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.phase_seconds[name] = (self.phase_seconds.get(name, 0.0)
+                                        + time.perf_counter() - start)
 
-# Check if the lock file exists
-if os.path.exists(LOCK_FILE):
-    messagebox.showerror("Error", "LetterBoxed is already running. Exiting.")
-    sys.exit()
+    def as_dict(self) -> dict:
+        """ The stats as a dictionary of plain values. """
+        return {'prefix_probes': self.prefix_probes,
+                'membership_checks': self.membership_checks,
+                'nodes_expanded': self.nodes_expanded,
+                'pair_comparisons': self.pair_comparisons,
+                'word_count': self.word_count,
+                'pair_count': self.pair_count,
+                'cached': self.cached,
+                'phase_seconds': dict(self.phase_seconds)}
 
-with open(LOCK_FILE, 'w', encoding='UTF-8'):
-    pass
+    def to_json(self, indent: int | None = None) -> str:
+        """ The stats as JSON. """
+        return json.dumps(self.as_dict(), indent=indent)
 
-# Read the dictionary file and create a list of words without the dates.
-with open(dictionary_file, 'r', encoding='UTF-8') as file:
-    for line in file:
-        words_list = [line.split('\t')[0].strip() for line in file]
+def timed_phase(stats: SolveStats | None, name: str):
+    """ Time a phase into the stats, or do nothing if there are none. """
+    return nullcontext() if stats is None else stats.phase(name)
 
-def create_indexed_dictionary(words: list[str]) -> dict[str, list[str]]:
-    """Create a dictionary with words grouped by their first two letters."""
-    indexed_dictionary = {}
-    for word in words:
-        key = word[:2]
-        indexed_dictionary.setdefault(key, []).append(word)
-    return indexed_dictionary
-
-dictionary: dict[str, list[str]] = create_indexed_dictionary(words_list)
-
-def is_word(word: str) -> bool:
-    """Checks if a word is present in the dictionary."""
-    prefix = word[:2]
-    return prefix in dictionary and word in dictionary[prefix]
-
-def has_word_starting_with(prefix: str) -> bool:
-    """Check if there are words starting with the given prefix."""
-    if prefix[:2] in dictionary:
-        words = dictionary[prefix[:2]]
-        return any(word.startswith(prefix) for word in words)
-    return False
-
-def find_candidate_words(prefix: str, letters: str) -> list[str]:
-    """Append each candidate to the prefix.
-       Return words that start with the result."""
-    return [prefix + letter for letter in letters if has_word_starting_with(
-        prefix + letter)]
+def check_sides(sides) -> list[str]:
+    """Return the sides in lower case, or raise ValueError if they are not
+       four sides of three letters with no letter used twice."""
+    if not isinstance(sides, list) or len(sides) != SIDES or not all(
+            isinstance(side, str) and len(side) == LETTERS_ON_SIDE
+            and side.isalpha() and side.isascii() for side in sides):
+        raise ValueError(f"sides must be {SIDES} sides of {LETTERS_ON_SIDE} letters")
+    sides = [side.lower() for side in sides]
+    if len(set(''.join(sides))) != SIDES * LETTERS_ON_SIDE:
+        raise ValueError("a letter is used more than once")
+    return sides
+
+def find_candidate_words(prefix: str, node, letters: str,
+                         lexicon: Lexicon) -> list[tuple[str, object, bool]]:
+    """Append each candidate to the prefix. Return the results that words
+       start with, with their trie nodes and whether they are words."""
+    return [(prefix + letter, next_node, is_word) for letter, next_node, is_word
+            in lexicon.children(node, letters)]
 
 def find_next_letter_candidates(dname:  dict[str, int], exclude: int) -> str:
     """ Find the letters around the box excluding those on the current side """
@@ -84,75 +119,283 @@ def create_dictionary(named_as: list[str]) ->  dict[str, int]:
             d[named_as[i][j]] = i
     return d
 
-def looking_for(word: str, dname: dict[str, int]) -> list[str]:
+def looking_for(word: str, node, next_letters: dict[str, str],
+                found_words: list[str], lexicon: Lexicon) -> list[tuple[str, object, bool]]:
     """ For the last letter of a string add a candidate letter and return
         the results if there are words starting with the new string.
         If the string is a word add it to a list of words found. """
-    start_with = word[-1]
-    next_letter_candidates = find_next_letter_candidates(dname, start_with)
-    clist = find_candidate_words(word, next_letter_candidates)
-    for the_word in clist:
-        if is_word(the_word):
+    clist = find_candidate_words(word, node, next_letters[word[-1]], lexicon)
+    for the_word, _, is_word in clist:
+        if is_word:
             found_words.append(the_word)
     return clist
 
-def find_words(letter_box) -> None:
-    """ For each letter on the sides of the box
-        find the words that start with it. """
-    letter_side = create_dictionary(letter_box)
-    matrix = []
-    p_line = 0
-    col = 0
-    side = 0
-    letter_on_side = 0
-    for side in range(SIDES):
-        for letter_on_side in range(LETTERS_ON_SIDE):
-            word = letter_box[side][letter_on_side]
-            matrix.append(looking_for(word, letter_side))
-            while p_line != len(matrix):
-                for col in range(len(matrix[p_line])):
-                    word = matrix[p_line][col]
-                    matrix.append(looking_for(word, letter_side))
-                p_line += 1
-            continue
-    matrix.clear()
-
-def find_pairs(word_counts: dict[str, int]) -> list[tuple[str, str]]:
-    """ Find pairs of words with at least 12 unique letters """
-    sorted_by_count = sorted(word_counts.items(), key=lambda x: x[1])
-    reversed_sorted = sorted(sorted_by_count, key=lambda x: x[1], reverse=True)
-    pairs = []
-    for right_word, _ in reversed_sorted:
-        if len(set(right_word)) >= 12:
-            pairs.append((right_word, 'SINGLETON'))
-            break
-        for left_word, _ in sorted_by_count:
-            if right_word[0] == left_word[-1] and \
-                right_word != left_word and \
-                    len(set(left_word + right_word)) >= 12:
-                pairs.append((left_word, right_word))
-    return sorted(pairs, key=lambda x: len(set(x[0] + x[1])))
-
-def find_longest_words(pairs: list[tuple[str, str]]) -> tuple[int, int]:
+def word_masks(words) -> tuple[int, dict[str, int]]:
+    """ Give each word a bit for each of the box letters in it.
+        Return the mask of all the box letters and the word masks. """
+    letters = sorted(set(''.join(words)))
+    bits = {letter: 1 << i for i, letter in enumerate(letters)}
+    masks = {}
+    for word in words:
+        mask = 0
+        for letter in word:
+            mask |= bits[letter]
+        masks[word] = mask
+    return (1 << len(letters)) - 1, masks
+
+def group_words(masks: dict[str, int], sort: bool = False
+                ) -> dict[str, list[tuple[str, int, list[str]]]]:
+    """ Words with the same first and last letters and the same letters
+        covered are interchangeable, so they are searched as one group.
+        Return the groups by first letter, each as its last letter, mask
+        and words. Sorted, each group is shortest word first and the
+        groups for a letter are shortest first. """
+    grouped: dict[tuple[str, str, int], list[str]] = {}
+    for word, mask in masks.items():
+        grouped.setdefault((word[0], word[-1], mask), []).append(word)
+    by_first: dict[str, list[tuple[str, int, list[str]]]] = {}
+    for (first, last, mask), group in grouped.items():
+        if sort and len(group) > 1:
+            group.sort(key=lambda word: (len(word), word))
+        by_first.setdefault(first, []).append((last, mask, group))
+    if sort:
+        for groups in by_first.values():
+            groups.sort(key=lambda group: len(group[2][0]))
+    return by_first
+
+def chain_reach(by_first: dict[str, list[tuple[str, int, list[str]]]],
+                max_words: int) -> list[dict[str, int]]:
+    """ reach[k][letter] is every box letter that a chain of k words
+        starting with the letter could cover. Used to prune the search. """
+    reach = [{letter: 0 for letter in by_first}]
+    for _ in range(max_words):
+        previous = reach[-1]
+        reach.append({letter: reduce(
+            or_, (mask | previous.get(last, 0) for last, mask, _ in groups), 0)
+                      for letter, groups in by_first.items()})
+    return reach
+
+def iter_chains(words, max_words: int = MAX_WORDS,
+                stats: SolveStats | None = None) -> Iterator[tuple[str, ...]]:
+    """ Yield the chains of words, each starting with the last letter of
+        the one before, that use all 12 letters with the fewest words,
+        as they are found. The words tried are counted in the stats. """
+    full, masks = word_masks(words)
+    if full.bit_count() < SIDES * LETTERS_ON_SIDE:
+        return
+    by_first = group_words(masks)
+    reach = chain_reach(by_first, max_words)
+
+    @cache
+    def complete(last, mask, left) -> tuple[tuple[list[str], ...], ...]:
+        """ The ways to cover the rest of the letters with left more words
+            when the chain so far ends with last and covers mask. """
+        found = []
+        options = by_first.get(last, ())
+        if stats is not None:
+            stats.pair_comparisons += len(options)
+        for next_last, next_mask, group in options:
+            covered = mask | next_mask
+            if left == 1:
+                if covered == full:
+                    found.append((group,))
+            elif covered | reach[left - 1].get(next_last, 0) == full:
+                found.extend((group,) + rest
+                             for rest in complete(next_last, covered, left - 1))
+        return tuple(found)
+
+    for count in range(1, max_words + 1):
+        found = False
+        for groups in by_first.values():
+            if stats is not None:
+                stats.pair_comparisons += len(groups)
+            for last, mask, group in groups:
+                if count == 1:
+                    chains = [(group,)] if mask == full else []
+                elif mask | reach[count - 1].get(last, 0) == full:
+                    chains = [(group,) + rest
+                              for rest in complete(last, mask, count - 1)]
+                else:
+                    continue
+                for chain in (chain for chain_groups in chains
+                              for chain in product(*chain_groups)):
+                    if len(set(chain)) == len(chain):
+                        found = True
+                        yield chain
+        if found:
+            return
+
+def find_chains(words, max_words: int = MAX_WORDS,
+                stats: SolveStats | None = None) -> list[tuple[str, ...]]:
+    """ Find the chains of words, each starting with the last letter of
+        the one before, that use all 12 letters with the fewest words. """
+    return sorted(iter_chains(words, max_words, stats), key=solution_rank)
+
+def find_pairs(words, stats: SolveStats | None = None) -> list[tuple[str, ...]]:
+    """ Find the pairs of words with all 12 letters. If there are none
+        find the fewest words, up to MAX_WORDS, that have them all. """
+    return find_chains(words, MAX_WORDS, stats)
+
+def repeated_letters(chain: tuple[str, ...]) -> int:
+    """ The number of letters used more than once in the chain, not
+        counting the letter each word shares with the one before. """
+    text = chain[0] + ''.join(word[1:] for word in chain[1:])
+    return sum(1 for uses in Counter(text).values() if uses > 1)
+
+def solution_rank(chain: tuple[str, ...]) -> tuple:
+    """ Fewest words, then fewest letters, then fewest repeated letters. """
+    return (len(chain), len(''.join(chain)), repeated_letters(chain), chain)
+
+def iter_solutions(words, limit: int | None = None,
+                   max_words: int = MAX_WORDS) -> Iterator[tuple[str, ...]]:
+    """ Yield the chains that use all 12 letters in ranked order, see
+        solution_rank, stopping after limit of them. Without a limit only
+        the chains with the fewest words are yielded, as by find_chains;
+        with one, chains of more words follow if there are too few.
+
+        The chains of each length are found best first: a heap of partial
+        chains ordered by their letters so far plus the fewest letters
+        that could finish them. A chain is yielded once no partial chain
+        could still finish shorter, so the work stops with the last
+        chain asked for. """
+    full, masks = word_masks(words)
+    if full.bit_count() < SIDES * LETTERS_ON_SIDE or limit == 0:
+        return
+    by_first = group_words(masks, sort=True)
+    reach = chain_reach(by_first, max_words)
+
+    @cache
+    def covering(first: str, bit: int) -> list[tuple[int, int]]:
+        """ The masks and shortest lengths of the groups for the first
+            letter that cover the letter of the bit, shortest first. The
+            search for a last word need only look at those for a letter
+            that few of them have. """
+        return [(mask, len(group[0])) for _, mask, group in by_first[first]
+                if mask & bit]
+
+    @cache
+    def shortest(first: str, mask: int, left: int) -> float:
+        """ The fewest letters in left more words, the first starting
+            with first, that cover the rest of the letters. inf if none
+            can. Repeated words are allowed, so it is a lower bound. """
+        if left == 0:
+            return 0 if mask == full else inf
+        if mask | reach[left].get(first, 0) != full:
+            return inf
+        if left == 1:
+            # The groups are shortest first, so the first to cover the
+            # rest of the letters is the shortest that does.
+            needed = full & ~mask
+            if not needed:
+                return len(by_first[first][0][2][0])
+            rarest, bits = None, needed
+            while bits:
+                bit = bits & -bits
+                if rarest is None or len(covering(first, bit)) < len(rarest):
+                    rarest = covering(first, bit)
+                bits ^= bit
+            for next_mask, length in rarest:
+                if next_mask & needed == needed:
+                    return length
+            return inf
+        best = inf
+        for last, next_mask, group in by_first[first]:
+            if len(group[0]) + left - 1 >= best:
+                break  # The groups after are no shorter.
+            best = min(best, len(group[0])
+                       + shortest(last, mask | next_mask, left - 1))
+        return best
+
+    def at_least(first: str, mask: int, left: int) -> float:
+        """ A quick lower bound on shortest: each word adds at least one
+            letter after the one it shares, and uses up a letter of its
+            own. """
+        if left == 0:
+            return 0 if mask == full else inf
+        if mask | reach[left].get(first, 0) != full:
+            return inf
+        return max((full & ~mask).bit_count(), left) + left
+
+    # A partial chain is the words before, plus the next word of a group.
+    # Only one word of a group is on the heap at a time, the next is put
+    # on when it comes off. The letters needed to finish are first taken
+    # from at_least, and worked out with shortest only if the chain comes
+    # off the heap.
+    frontier = []  # (bound, length, tie, before, group, index, mask, rest,
+                   #  exact)
+    tie = counter()  # Keeps the heap from comparing chains.
+
+    def push(before, length, group, index, mask, rest, exact):
+        if index < len(group) and rest < inf:
+            length += len(group[index])
+            heappush(frontier, (length + rest, length, next(tie), before,
+                                group, index, mask, rest, exact))
+
+    found = 0
+    for word_count in range(1, max_words + 1):
+        frontier.clear()
+        for groups in by_first.values():
+            for last, mask, group in groups:
+                rest = at_least(last, mask, word_count - 1)
+                if rest < inf:
+                    length = len(group[0])
+                    frontier.append((length + rest, length, next(tie), (),
+                                     group, 0, mask, rest, False))
+        heapify(frontier)
+        done = []  # (rank, chain)
+        while frontier or done:
+            while done and (not frontier or done[0][0][1] < frontier[0][0]):
+                yield heappop(done)[1]
+                found += 1
+                if found == limit:
+                    return
+            if not frontier:
+                break
+            _, length, _, before, group, index, mask, rest, exact = \
+                heappop(frontier)
+            word = group[index]
+            if not exact:
+                push(before, length - len(word), group, index, mask,
+                     shortest(word[-1], mask, word_count - len(before) - 1), True)
+                continue
+            push(before, length - len(word), group, index + 1, mask, rest, True)
+            if word in before:
+                continue
+            chain = before + (word,)
+            if len(chain) == word_count:
+                heappush(done, (solution_rank(chain), chain))
+                continue
+            left = word_count - len(chain) - 1
+            for last, next_mask, next_group in by_first.get(word[-1], ()):
+                covered = mask | next_mask
+                push(chain, length, next_group, 0, covered,
+                     at_least(last, covered, left), False)
+        if found and limit is None:
+            return
+
+def best_solution(words) -> tuple[str, ...] | None:
+    """ The best chain that uses all 12 letters, or None. """
+    return next(iter_solutions(words, limit=1), None)
+
+def find_longest_words(pairs: list[tuple[str, ...]]) -> tuple[int, ...]:
     """ Find the longest words in the pairs and return the lengths. """
-    longest_left = 0
-    longest_right = 0
-    for left_word, right_word in pairs:
-        longest_left = max(longest_left, len(left_word))
-        longest_right = max(longest_right, len(right_word))
-    return (longest_left + 1, longest_right + 1)
-
-def format_pairs(word_pairs: dict[str, list[str]]) -> tuple[int, tuple[str], list[str]]:
+    longest = [0] * max((len(pair) for pair in pairs), default=2)
+    for pair in pairs:
+        for i, word in enumerate(pair):
+            longest[i] = max(longest[i], len(word))
+    return tuple(length + 1 for length in longest)
+
+def format_pairs(pairs: list[tuple[str, ...]]) -> tuple[int, list[str], tuple[str, ...]]:
     """Return the number of pairs found a list of the pairs."""
     print_lines = []
-    pairs = sorted(find_pairs(word_pairs), key=lambda x: len(x[0] + x[1]))
     num_rows = max(1, round((len(pairs)) // 2))
     num_cols = max(1, round((len(pairs)) // num_rows)) + 1
     fill  = find_longest_words(pairs)
     for row in range(num_rows):
         row_line = []
         for p in pairs[row * num_cols:(row + 1) * num_cols]:
-            f = f"{len(p[0] + p[1])}: {p[0].ljust(fill[0])}{p[1].ljust(fill[1])}"
+            words = ''.join(word.ljust(width) for word, width in zip(p, fill))
+            f = f"{len(''.join(p))}: {words.ljust(sum(fill))}"
             row_line.append(f)
         display_line = ''.join(row_line).strip()
         if len(display_line) > 0:
@@ -162,45 +405,278 @@ def format_pairs(word_pairs: dict[str, list[str]]) -> tuple[int, tuple[str], lis
         case 1: return (1, print_lines, pairs[0])
         case _: return (len(pairs), print_lines, pairs[0])
 
-def find_all_words(letter_box: list[str]) -> tuple[int, list[str], tuple[str, str]]:
-    """ Does the work of finding words in the dictionary """
-    find_words(letter_box)
-    found_words.sort()
-    uniqueness: dict[str, int] = {word: len(set(word)) for word in found_words}
-    # sort the words by the number of unique letters in the word.
-    ordered_dict: dict[str, int] = dict(
-        sorted(uniqueness.items(), key=lambda x: (x[1], x[0])))
-    # Format the pairs for display.
-    return format_pairs(ordered_dict)
-
-def get_solution(signature, first_pair) -> list[str]:
-    """ Get the solution from the file. """
-    decrypt_file(solution_file)
-    with open(solution_file, 'r', encoding='UTF-8') as solutions:
-        for solution in solutions:
-            fields = solution.split('*')
-            if fields[3].strip() == signature:
-                encrypt_file(solution_file)
-                return ast.literal_eval(fields[1])
-    encrypt_file(solution_file)
-    return first_pair
-
-def process_data(data, input_form) -> None:
-    """ Process the data from and to the form. """
+class Solver:
+    """ Finds the words and pairs for letter boxes from one lexicon.
+        Nothing is kept between solves, so a solver can be reused
+        for any number of boxes and shared between threads. """
+
+    def __init__(self, lexicon: Lexicon, cache: ResultCache | None = None):
+        self.lexicon = lexicon
+        self.cache = cache if lexicon.version is not None else None
+
+    @classmethod
+    def from_file(cls, the_file: str, cache: ResultCache | None = None) -> 'Solver':
+        """Create a solver for the words in a dictionary file,
+           through its compiled lexicon."""
+        return cls(load_lexicon(the_file), cache)
+
+    def known_on(self, the_date: str) -> 'Solver':
+        """ A solver with only the words in the dictionary on a date. """
+        return Solver(self.lexicon.known_on(the_date), self.cache)
+
+    def is_word(self, word: str) -> bool:
+        """Checks if a word is present in the dictionary."""
+        return self.lexicon.is_word(word)
+
+    def has_word_starting_with(self, prefix: str) -> bool:
+        """Check if there are words starting with the given prefix."""
+        return self.lexicon.has_prefix(prefix)
+
+    def find_words(self, letter_box: list[str], stats: SolveStats | None = None,
+                   starts: str | None = None) -> list[str]:
+        """ For each letter on the sides of the box, or each of the
+            starts if given, find the words that start with it. The words
+            of each letter are found apart from the others, in box order. """
+        found_words = []
+        letter_side = create_dictionary(letter_box)
+        # The letters that may follow each letter, worked out once per box.
+        next_letters = {letter: find_next_letter_candidates(letter_side, letter)
+                        for letter in letter_side}
+        lexicon = self.lexicon
+        matrix = []
+        p_line = 0
+        for side in range(SIDES):
+            for letter_on_side in range(LETTERS_ON_SIDE):
+                word = letter_box[side][letter_on_side]
+                if starts is not None and word not in starts:
+                    continue
+                node = lexicon.child(lexicon.root, word)
+                if node is None:
+                    continue
+                matrix.append(
+                    looking_for(word, node, next_letters, found_words, lexicon))
+                while p_line != len(matrix):
+                    for word, node, _ in matrix[p_line]:
+                        matrix.append(looking_for(
+                            word, node, next_letters, found_words, lexicon))
+                    p_line += 1
+        if stats is not None:
+            # Counted from what the search kept, so the search itself is not
+            # slowed. Each row of the matrix is the expansion of one prefix,
+            # which tries the letters on the other sides, after the first
+            # letters were tried from the root.
+            stats.nodes_expanded += len(matrix)
+            first_letters = SIDES * LETTERS_ON_SIDE if starts is None \
+                else len(starts)
+            stats.prefix_probes += first_letters + \
+                (SIDES - 1) * LETTERS_ON_SIDE * len(matrix)
+            stats.membership_checks += sum(len(row) for row in matrix)
+        return found_words
+
+    def cached_result(self, letter_box: list[str]
+                      ) -> tuple[list[str], list[tuple[str, ...]]] | None:
+        """ Return the words and pairs for the box, or any reordering of
+            it, from the result cache. None if they are not there. """
+        if self.cache is None:
+            return None
+        return self.cache.get(letter_box, self.lexicon.version)
+
+    def remember(self, letter_box: list[str], words: list[str],
+                 pairs: list[tuple[str, ...]]) -> None:
+        """ Put the words and pairs for the box in the result cache. """
+        if self.cache is not None:
+            self.cache.put(letter_box, self.lexicon.version, words, pairs)
+
+    def solve(self, letter_box: list[str], stats: SolveStats | None = None
+              ) -> tuple[list[str], list[tuple[str, ...]]]:
+        """ Return the sorted words for the box and its pairs,
+            shortest first. If stats are given the work is counted
+            and timed in them. """
+        with timed_phase(stats, 'cache_lookup'):
+            cached = self.cached_result(letter_box)
+        if cached is not None:
+            if stats is not None:
+                stats.cached = True
+                stats.word_count, stats.pair_count = map(len, cached)
+            return cached
+        with timed_phase(stats, 'word_search'):
+            words = sorted(self.find_words(letter_box, stats))
+        with timed_phase(stats, 'pair_search'):
+            pairs = sorted(find_pairs(words, stats), key=lambda x: len(''.join(x)))
+        with timed_phase(stats, 'cache_store'):
+            self.remember(letter_box, words, pairs)
+        if stats is not None:
+            stats.word_count, stats.pair_count = len(words), len(pairs)
+        return words, pairs
+
+    def solve_with_stats(self, letter_box: list[str], use_cache: bool = True
+                         ) -> tuple[list[str], list[tuple[str, ...]], SolveStats]:
+        """ Solve the box and return the stats with the results.
+            Without the cache the search is always run and counted. """
+        stats = SolveStats()
+        solver = self
+        if not use_cache:
+            # The same solver without the cache, searching the same way.
+            solver = copy(self)
+            solver.cache = None
+        words, pairs = solver.solve(letter_box, stats)
+        return words, pairs, stats
+
+    def best(self, letter_box: list[str]) -> tuple[str, ...] | None:
+        """ The best chain for the box, found without working out the rest. """
+        cached = self.cached_result(letter_box)
+        if cached is not None:
+            return cached[1][0] if cached[1] else None
+        return best_solution(self.find_words(letter_box))
+
+    def find_all_words(self, letter_box: list[str],
+                       stats: SolveStats | None = None) -> tuple[int, list[str], tuple[str, ...]]:
+        """ Does the work of finding words in the dictionary """
+        _, pairs = self.solve(letter_box, stats)
+        # Format the pairs for display.
+        with timed_phase(stats, 'formatting'):
+            return format_pairs(pairs)
+
+# The solver of a worker process in a pool, made once by init_worker.
+_worker_solver: Solver | None = None
+
+def init_worker(the_file: str, cache_dir: str = CACHE_DIR) -> None:
+    """ Map the compiled lexicon once for each worker process. The parent
+        compiles it first, so the workers share its pages. """
+    global _worker_solver
+    _worker_solver = Solver(load_lexicon(the_file, cache_dir))
+
+def worker_solver() -> Solver:
+    """ The solver init_worker made for this worker process. """
+    return _worker_solver
+
+def get_solution(store: SolutionStore, signature, first_pair) -> list[str]:
+    """ Get NYT's solution from the store, or the first pair. """
+    return store.get_solution(signature, first_pair)
+
+def solve_in_background(solver: Solver, letter_box: list[str],
+                        results: queue.Queue, cancel: threading.Event,
+                        precomputer: 'Precomputer | None' = None) -> None:
+    """ Solve the box on a worker thread. Put the word count, each pair
+        as it is found and then all the pairs, sorted, on the queue.
+        The words come from the precomputer if there is one, which has
+        worked them out while the letters were typed. """
     try:
-        returned: tuple[int, list[str], tuple[str, str]] = find_all_words(data)
-        pair_count: int = returned[0]
-        print_lines: list[str] = returned[1]
-        signature: str = ''.join(sorted(set(''.join(returned[2]))))
-        answers: list[str] = get_solution(signature, returned[2])
-        OutputForm(print_lines, answers, pair_count, input_form, LOCK_FILE)
+        cached = solver.cached_result(letter_box)
+        if cached is not None:
+            words, pairs = cached
+            results.put(('words', len(words)))
+            results.put(('done', pairs))
+            return
+        if precomputer is not None:
+            words = precomputer.words_for(letter_box)
+        else:
+            words = sorted(solver.find_words(letter_box))
+        results.put(('words', len(words)))
+        pairs = []
+        for pair in iter_chains(words):
+            if cancel.is_set():
+                return
+            pairs.append(pair)
+            results.put(('pair', pair))
+        pairs.sort(key=solution_rank)
+        solver.remember(letter_box, words, pairs)
+        results.put(('done', pairs))
     except Exception as e:
-        if os.path.exists(LOCK_FILE):
-            os.remove(LOCK_FILE)
-        raise e
+        results.put(('error', e))
+
+def poll_results(store: SolutionStore, output_form: 'OutputForm',
+                 results: queue.Queue, cancel: threading.Event) -> None:
+    """ Pass what the worker has found so far to the form
+        and come back for more until it is done. """
+    new_pairs = []
+    while not cancel.is_set():
+        try:
+            kind, value = results.get_nowait()
+        except queue.Empty:
+            break
+        match kind:
+            case 'words':
+                output_form.word_count = value
+            case 'pair':
+                new_pairs.append(value)
+            case 'done':
+                best = value[0] if value else ["", ""]
+                signature: str = ''.join(sorted(set(''.join(best))))
+                answers: list[str] = get_solution(store, signature, best)
+                output_form.show_progress(new_pairs)
+                output_form.show_results(value, answers, len(value))
+                return
+            case 'error':
+                raise value
+    if cancel.is_set():
+        return
+    output_form.show_progress(new_pairs)
+    output_form.root.after(POLL_MS, poll_results, store, output_form,
+                           results, cancel)
+
+def process_data(solver: Solver, store: SolutionStore,
+                 precomputer: 'Precomputer | None', data, input_form) -> 'OutputForm':
+    """ Process the data from and to the form. The solving is done on a
+        worker thread so the forms keep responding. """
+    from letterboxed_forms import OutputForm
+    results: queue.Queue = queue.Queue()
+    cancel = threading.Event()
+    output_form = OutputForm(input_form, on_cancel=cancel.set)
+    threading.Thread(target=solve_in_background,
+                     args=(solver, data, results, cancel, precomputer),
+                     daemon=True).start()
+    poll_results(store, output_form, results, cancel)
+    return output_form
+
+def poll_instance(instance: Instance, form) -> None:
+    """ Solve the puzzles passed on by later launches. """
+    while True:
+        try:
+            sides = instance.requests.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            form.show_puzzle(check_sides(sides) if sides else None)
+        except ValueError:
+            continue
+    form.root.after(POLL_MS, poll_instance, instance, form)
+
+def main(argv=None) -> None:
+    """ Run the forms, or pass the sides given to the copy already
+        running, which has the dictionary loaded. """
+    from letterboxed_forms import InputForm
+    from letterboxed_precompute import Precomputer
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        sides = check_sides(argv) if argv else []
+    except ValueError as e:
+        sys.exit(f"letterboxed: {e}")
+    if hand_off(sides):
+        return
+    with Instance() as instance:
+        # Read local copies of the share's files, copied again if changed.
+        # The three are checked at the same time, for a second at most.
+        shares = ShareCache()
+        for share_file in (dictionary_file, solution_file,
+                           features_path(dictionary_file)):
+            shares.start(share_file)
+        solver = Solver.from_file(shares.fetch(dictionary_file), ResultCache())
+        store = SolutionStore(shares.fetch(solution_file))
+        try:
+            features = load_features(shares.fetch(features_path(dictionary_file)),
+                                     solver.lexicon.version)
+        except OSError:
+            features = None  # No features file on the share yet.
+        # Start working out the words while the letters are typed.
+        precomputer = Precomputer(solver, features)
+        form = InputForm(partial(process_data, solver, store, precomputer),
+                         on_change=precomputer.update)
+        poll_instance(instance, form)
+        if sides:
+            form.show_puzzle(sides)
+        form.run()
+        precomputer.close()
 
 if __name__ == "__main__":
-    form = InputForm(process_data)
-    form.run()
-if os.path.exists(LOCK_FILE):
-    os.remove(LOCK_FILE)
+    main()
@@ -0,0 +1,73 @@
+"""Solve every box in the solutions archive without the forms.
+
+The archive is read once into a SolutionStore and the boxes are shared
+out over a pool of processes, each with its own solver. One JSON line is
+written for each puzzle, in archive order. With --as-of-day each box is
+solved with only the words in the dictionary on its day.
+
+    python letterboxed_batch.py --dictionary daily_dictionaries.txt
+        --solutions letterboxed_solutions.txt --output results.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from letterboxed import dictionary_file, init_worker, solution_file, worker_solver
+from letterboxed_lexicon import load_lexicon
+from solution_store import SolutionStore
+
+
+def solve_puzzle(puzzle: dict, as_of_day: bool = False) -> dict:
+    """Solve one box and return the results to be written. With as_of_day
+       only the words in the dictionary on the puzzle's day are used."""
+    solver = worker_solver()
+    if as_of_day:
+        solver = solver.known_on(puzzle['date'])
+    words, pairs = solver.solve(puzzle['sides'])
+    return {'date': puzzle['date'],
+            'sides': puzzle['sides'],
+            'word_count': len(words),
+            'pair_count': len(pairs),
+            'best_pair': list(pairs[0]) if pairs else [],
+            'our_solution': puzzle['solution'],
+            'found_our_solution': tuple(puzzle['solution']) in set(pairs)}
+
+
+def main(argv=None) -> None:
+    """Solve the whole archive and report how fast it went."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dictionary', default=dictionary_file)
+    parser.add_argument('--solutions', default=solution_file)
+    parser.add_argument('--output', help="JSON Lines file, stdout if not given")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--as-of-day', action='store_true',
+                        help="Use only the words known on each puzzle's day")
+    args = parser.parse_args(argv)
+
+    puzzles = SolutionStore(args.solutions).records
+    start = time.perf_counter()
+    output = (open(args.output, 'w', encoding='UTF-8') if args.output
+              else sys.stdout)
+    # Compiled here first, so the workers only map it.
+    load_lexicon(args.dictionary)
+    try:
+        with ProcessPoolExecutor(args.workers, initializer=init_worker,
+                                 initargs=(args.dictionary,)) as pool:
+            chunksize = max(1, len(puzzles) // (4 * (args.workers or 1)))
+            for result in pool.map(partial(solve_puzzle, as_of_day=args.as_of_day),
+                                   puzzles, chunksize=chunksize):
+                output.write(json.dumps(result) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - start
+    print(f"Solved {len(puzzles):,d} puzzles in {elapsed:.2f}s, "
+          f"{len(puzzles) / elapsed:.1f} puzzles per second.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Solve Letter Boxed puzzles from the command line, with no forms.
+
+    python -m letterboxed_cli abc def ghi jkl
+    python -m letterboxed_cli abc,def,ghi,jkl --show pairs --json
+    python -m letterboxed_cli --show words < puzzles.txt
+
+The sides are given as arguments, or read from stdin with a puzzle on
+each line, as four words or split by commas or dashes. Shown are the
+best solution, all the pairs or all the words, as text or as a line of
+JSON for each puzzle. The words can be limited to those known on a date
+or first seen in the last few days. With --workers the words of each
+box are found on a pool of processes. Nothing here needs tkinter or a
+display."""
+import argparse
+import json
+import re
+import sys
+from typing import Iterator
+
+from letterboxed import Solver, check_sides, dictionary_file
+from letterboxed_lexicon import load_lexicon
+from parallel_search import ParallelSolver
+from result_cache import ResultCache
+
+SHOW = ('best', 'pairs', 'words')
+
+
+def parse_sides(text: str) -> list[str]:
+    """The sides in a line such as "abc def ghi jkl" or "abc,def,ghi,jkl"."""
+    return check_sides(re.split(r"[\s,\-]+", text.strip()))
+
+
+def iter_puzzles(sides: list[str], stdin) -> Iterator[str]:
+    """Yield each puzzle given, as its line of text."""
+    if sides:
+        yield ' '.join(sides)
+        return
+    for line in stdin:
+        if line.strip() and not line.lstrip().startswith('#'):
+            yield line
+
+
+def as_text(words: list[str], pairs: list[tuple[str, ...]], show: str) -> list[str]:
+    """The lines to print for a puzzle."""
+    match show:
+        case 'words':
+            return words
+        case 'pairs':
+            return [f"{len(''.join(pair))}: {' '.join(pair)}" for pair in pairs]
+        case _:
+            return [' '.join(pairs[0]) if pairs else "No solution"]
+
+
+def as_json(sides: list[str], words: list[str], pairs: list[tuple[str, ...]],
+            show: str) -> dict:
+    """The JSON object to print for a puzzle."""
+    result = {'sides': sides, 'word_count': len(words),
+              'pair_count': len(pairs),
+              'best': list(pairs[0]) if pairs else []}
+    if show == 'pairs':
+        result['pairs'] = [list(pair) for pair in pairs]
+    elif show == 'words':
+        result['words'] = words
+    return result
+
+
+def main(argv=None, stdin=None, stdout=None) -> int:
+    """Solve the puzzles. Return 2 if any of them could not be read."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sides', nargs='*',
+                        help="The sides, or none to read puzzles from stdin")
+    parser.add_argument('--show', choices=SHOW, default='best')
+    parser.add_argument('--json', action='store_true',
+                        help="Print a line of JSON for each puzzle")
+    parser.add_argument('--dictionary', default=dictionary_file)
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Don't read or write the result cache")
+    parser.add_argument('--known-on', metavar='DATE',
+                        help="Use only the words in the dictionary on the date")
+    parser.add_argument('--first-seen-within', type=int, metavar='DAYS',
+                        help="Use only the words first seen in the last DAYS days")
+    parser.add_argument('--stats', action='store_true',
+                        help="Add the counts and timings of each solve")
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help="Find the words on N processes, a starting "
+                             "letter to each")
+    args = parser.parse_args(argv)
+    if args.workers and (args.known_on or args.first_seen_within is not None):
+        parser.error("--workers can't be used with --known-on or "
+                     "--first-seen-within")
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+
+    cache = None if args.no_cache else ResultCache()
+    if args.workers:
+        solver = ParallelSolver(args.dictionary, cache, args.workers)
+    else:
+        lexicon = load_lexicon(args.dictionary)
+        if args.first_seen_within is not None:
+            lexicon = lexicon.first_seen_within(args.first_seen_within,
+                                                args.known_on)
+        elif args.known_on is not None:
+            lexicon = lexicon.known_on(args.known_on)
+        solver = Solver(lexicon, cache)
+    try:
+        return solve_all(args, solver, stdin, stdout)
+    finally:
+        if isinstance(solver, ParallelSolver):
+            solver.close()
+
+
+def solve_all(args, solver: Solver, stdin, stdout) -> int:
+    """Solve each puzzle given. Return 2 if any could not be read."""
+    status = 0
+    for line in iter_puzzles(args.sides, stdin):
+        try:
+            sides = parse_sides(line)
+        except ValueError as e:
+            print(f"{line.strip()}: {e}", file=sys.stderr)
+            status = 2
+            continue
+        if args.show == 'best' and not (args.json or args.stats):
+            # Only the best is wanted, so stop the search once it is found.
+            best = solver.best(sides)
+            if not args.sides:
+                print(' '.join(sides), file=stdout)
+            print(' '.join(best) if best else "No solution", file=stdout)
+            continue
+        words, pairs, stats = solver.solve_with_stats(
+            sides, use_cache=not args.stats)
+        if args.json:
+            result = as_json(sides, words, pairs, args.show)
+            if args.stats:
+                result['stats'] = stats.as_dict()
+            print(json.dumps(result), file=stdout)
+            continue
+        if not args.sides:
+            print(' '.join(sides), file=stdout)
+        for text in as_text(words, pairs, args.show):
+            print(text, file=stdout)
+        if args.stats:
+            print(stats.to_json(), file=stdout)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,23 @@
 """Forms for inputting and displaying data."""
-import os
 import tkinter as tk
 from functools import partial
 
+from pair_view import SORTS, PairView
+
 BGC = 'Bisque1'
 FGC = 'dark red'
 
 
 class InputForm:
-    """Form for inputting data."""
+    """Form for inputting data. on_change, if given, is called with the
+    twelve letters, '' where empty, each time they change. submit_command
+    returns the form showing the results."""
 
-    def __init__(self, submit_command):
+    def __init__(self, submit_command, on_change=None):
         """Create the form."""
+        self.on_change = on_change
+        self.submit_command = submit_command
+        self.results_form = None
         self.root = tk.Tk()
         self.root.configure(bg=BGC)
         self.root.title("Letter Boxed")
@@ -71,8 +77,7 @@ class InputForm:
 
         self.submit_button = tk.Button(
             frame, text="Submit", bg=BGC, fg=FGC,
-            command=lambda: submit_command(
-                self.get_data(), self.root), state=tk.DISABLED)
+            command=self.submit, state=tk.DISABLED)
         self.submit_button.grid(row=5, column=1, pady=10,
                                 sticky=tk.EW, rowspan=2)
 
@@ -87,6 +92,32 @@ class InputForm:
             entry.delete(0, tk.END)
             self.entries[0].focus()
         self.submit_button.config(state=tk.DISABLED)
+        self.notify_change()
+
+    def submit(self):
+        """Solve the letters entered."""
+        self.results_form = self.submit_command(self.get_data(), self.root)
+
+    def show_puzzle(self, sides=None):
+        """Bring the form to the front, closing any results shown, and
+        solve the sides if given."""
+        if self.results_form is not None:
+            self.results_form.dismiss()
+            self.results_form = None
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+        if sides:
+            for value, letter in zip(self.entry_values, ''.join(sides)):
+                value.set(letter.upper())
+            self.notify_change()
+            self.submit_button.config(state=tk.NORMAL)
+            self.submit()
+
+    def notify_change(self):
+        """Pass the letters entered so far to on_change."""
+        if self.on_change is not None:
+            self.on_change([ev.get().lower() for ev in self.entry_values])
 
     def run(self):
         """Run the form."""
@@ -118,14 +149,17 @@ class InputForm:
             if all(ev.get() for ev in self.entry_values):
                 self.submit_button.config(state=tk.NORMAL)
                 self.submit_button.focus()
+        self.notify_change()
 
 
 class OutputForm:
-    """Form for displaying data."""
+    """Form for displaying data.
+
+    The form opens while the solve is still running. show_progress is
+    given the pairs as they are found and show_results the final ones.
+    They are kept in a PairView and shown in a ResultsList."""
 
-    def __init__(self,
-                 the_results, answer_pair, pair_count, input_form, lock_file,
-                 linked_form=None):
+    def __init__(self, input_form, linked_form=None, on_cancel=None):
         self.root = tk.Toplevel()
         self.root.title("Letter Boxed Results")
         self.root.configure(bg=BGC)
@@ -134,12 +168,15 @@ class OutputForm:
 
         linked_form = HintSubForm
 
-        self.the_results = the_results
-        self.answer_pair = answer_pair
-        self.pair_count = pair_count
+        self.view = PairView()
+        self.answer_pair = None
+        self.pair_count = 0
+        self.word_count = 0
         self.input_form = input_form
-        self.lock_file = lock_file
         self.linked_form = linked_form
+        self.on_cancel = on_cancel
+        self.results_list = None
+        self.hint_subform = None
 
         input_form.withdraw()
 
@@ -149,92 +186,123 @@ class OutputForm:
         # Create a frame inside a frame for appearance sake.
         mainframe = tk.Frame(self.root, relief=tk.RIDGE, borderwidth=4, bg=BGC)
         mainframe.pack(padx=10, pady=10)
-        frame = tk.Frame(mainframe, relief=tk.RIDGE, borderwidth=4, bg=BGC)
+        self.frame = frame = tk.Frame(
+            mainframe, relief=tk.RIDGE, borderwidth=4, bg=BGC)
         frame.pack(padx=10, pady=10)
 
-        # Add the exit button to the frame
-        action = "Exit"
-        if pair_count == 0:
-            action = "Correct the error."
+        # Add the cancel button to the frame, it becomes the exit button.
         self.btn_exit = tk.Button(
-            frame, text=action, bg=BGC, fg=FGC,
-            command=lambda: self.on_close(input_form, pair_count), padx=10, pady=10)
+            frame, text="Cancel", bg=BGC, fg=FGC,
+            command=self.cancel, padx=10, pady=10)
         self.btn_exit.grid(row=0, column=2, sticky=tk.NSEW)
 
-        # Add the hints to the frame
-        if pair_count != 0:
-            self.hint_subform = HintSubForm(
-                frame, self.answer_pair[0], self.answer_pair[1])
-            self.hint_subform.grid(row=0, column=1)
-        else:
-            self.label = tk.Label(
-                frame,
-                text="No pairs found.\nCheck your entries.",
-                padx=10, pady=10, font=("Arial", 10), bg=BGC, fg=FGC)
-            self.label.grid(row=0, column=1)
-
-        # Add the show button to the frame
-        plural = '' if pair_count == 1 else 's'
+        # Show the progress where the hints will go.
+        self.label = tk.Label(
+            frame,
+            text="Solving...",
+            padx=10, pady=10, font=("Arial", 10), bg=BGC, fg=FGC)
+        self.label.grid(row=0, column=1)
+
+        # Add the show button to the frame, shown once there are pairs.
         self.btn_show = tk.Button(
-            frame, text=f"Show The {pair_count} Pair{plural}",
-            command=lambda: self.text_box(self.the_results),
+            frame, text="Show The 0 Pairs",
+            command=self.text_box,
             padx=10, pady=20, bg=BGC, fg=FGC)
-        self.btn_show.grid(row=0, column=0, sticky=tk.NSEW)
 
         # Adjust the grid cell sizes to make the buttons the same size.
         for col in 0, 2:
             frame.grid_columnconfigure(
                 col, minsize=self.btn_show.winfo_reqwidth())
+        self.btn_exit.focus()
+
+    def show_pair_count(self):
+        """Show the number of pairs on the show button."""
+        plural = '' if self.pair_count == 1 else 's'
+        self.btn_show.config(text=f"Show The {self.pair_count} Pair{plural}")
+        if self.pair_count != 0 and not self.btn_show.winfo_ismapped() \
+                and self.results_list is None:
+            self.btn_show.grid(row=0, column=0, sticky=tk.NSEW)
+
+    def show_progress(self, new_pairs):
+        """Add the pairs found since the last call and show the progress."""
+        self.view.extend(new_pairs)
+        self.pair_count = len(self.view.pairs)
+        self.label.config(text=f"Solving...\n{self.word_count:,d} words, "
+                               f"{self.pair_count:,d} pairs so far.")
+        self.show_pair_count()
+        if self.results_list is not None and new_pairs:
+            self.results_list.refresh(follow=True)
+
+    def show_results(self, pairs, answer_pair, pair_count):
+        """Show the results of the finished solve."""
+        self.view.set_pairs(pairs)
+        self.answer_pair = answer_pair
+        self.pair_count = pair_count
+        self.on_cancel = None
 
+        # The cancel button becomes the exit button
+        action = "Exit"
         if pair_count == 0:
+            action = "Correct the error."
+        self.btn_exit.config(text=action, command=lambda: self.on_close(
+            self.input_form, self.pair_count))
+
+        # Add the hints to the frame
+        if pair_count != 0:
+            self.label.grid_forget()
+            self.hint_subform = HintSubForm(self.frame, *self.answer_pair)
+            self.hint_subform.grid(row=0, column=1)
+            self.show_pair_count()
+        else:
+            self.label.config(text="No pairs found.\nCheck your entries.")
             self.btn_show.grid_forget()
             self.btn_exit.focus()
 
+        # Replace the pairs found so far with the sorted results
+        if self.results_list is not None:
+            self.results_list.refresh()
+            self.update_linked_form()
+
     def update_linked_form(self):
         """Update the linked form with the chosen pair and more."""
         self.linked_form.update_text_box(self.hint_subform,
-            f"{len(self.answer_pair[0] + self.answer_pair[1])}: {
-                self.answer_pair[0]} {self.answer_pair[1]}")
+            f"{len(''.join(self.answer_pair))}: {' '.join(self.answer_pair)}")
         # Hide the show button to prevent multiple clicks
         self.btn_show.grid_forget()
 
-    def text_box(self, the_results):
-        """Create a text box for the results if more than one."""
-        if self.pair_count == 1:
+    def text_box(self):
+        """Show the list of results if more than one."""
+        solved = self.hint_subform is not None
+        if solved and self.pair_count == 1:
             self.update_linked_form()
             return
-        num_lines = len(the_results)  # Height of the text box
-        num_chars = max(len(line) for line in the_results)  # Width of the text box
-        # Create a scrollbar if the number of lines is greater than box_height
-        box_height = 30
-        if num_lines > box_height:
-            self.scrollbar = tk.Scrollbar(self.root, bg=FGC, troughcolor=BGC)
-            self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            self.text = tk.Text(
-                self.root,
-                height=box_height,
-                width=num_chars,
-                bg=BGC, fg=FGC,
-                yscrollcommand=self.scrollbar.set)
-            self.text.pack(side=tk.LEFT, fill=tk.BOTH, ipadx=10, ipady=2)
-            self.scrollbar.config(command=self.text.yview)
+        # Only a page of rows is ever drawn, however many pairs there are.
+        rows = min(len(self.view), ResultsList.ROWS) if solved else ResultsList.ROWS
+        self.results_list = ResultsList(self.root, self.view, max(rows, 1))
+        self.results_list.pack(fill=tk.BOTH, padx=10, pady=(0, 10))
+        if solved:
+            # show the chosen pair in the linked form
+            self.update_linked_form()
         else:
-            # Create a text box sized to fit the results
-            self.text = tk.Text(
-                self.root,
-                height=num_lines,
-                width=num_chars,
-                bg=BGC, fg=FGC)
-            self.text.pack(ipadx=10, ipady=2)
-
-        # Insert the results into the text box
-        self.text.insert(tk.END, "\n".join(the_results))
-        self.text.config(state=tk.DISABLED)
-        # show the chosen pair in the linked form
-        self.update_linked_form()
+            self.btn_show.grid_forget()
+
+    def cancel(self):
+        """Stop the solve and go back to the input form."""
+        if self.on_cancel is not None:
+            self.on_cancel()
+        self.input_form.deiconify()
+        self.root.destroy()
+
+    def dismiss(self):
+        """Close the form, stopping the solve if it is still running."""
+        if self.root.winfo_exists():
+            self.cancel()
 
     def on_form_x_click(self):
         """Called when the window is closed with the 'x' button."""
+        if self.on_cancel is not None:
+            self.cancel()
+            return
         input_form = self.input_form
         pair_count = self.pair_count
         self.on_close(input_form, pair_count)
@@ -246,18 +314,122 @@ class OutputForm:
             input_form.deiconify()
             self.root.withdraw()
         else:
-            # Remove the lock file
-            if os.path.exists(self.lock_file):
-                os.remove(self.lock_file)
             # Destroy the window and the input form
             self.root.destroy()
             input_form.destroy()
 
 
+class ResultsList(tk.Frame):
+    """A list of the pairs in a PairView, with controls to sort and filter
+    them. Only the rows in sight are put in the list box, and the scrollbar
+    and mouse wheel move that window over the view."""
+
+    ROWS = 30   # Rows shown at a time.
+    WIDTH = 48  # Characters in a row.
+
+    def __init__(self, master, view, rows=ROWS):
+        super().__init__(master, bg=BGC)
+        self.view = view
+        self.rows = rows
+        self.top = 0  # The index in the view of the first row shown.
+        self.at_end = True  # Whether the last rows are in sight.
+
+        # The sort and filters, applied as they are changed.
+        controls = tk.Frame(self, bg=BGC)
+        controls.pack(fill=tk.X, pady=(0, 4))
+        self.sort = tk.StringVar(value=view.sort)
+        self.max_length = tk.StringVar()
+        self.first_letter = tk.StringVar()
+        self.word_count = tk.StringVar(value='Any')
+        tk.Label(controls, text="Sort", bg=BGC, fg=FGC).pack(side=tk.LEFT)
+        sort_menu = tk.OptionMenu(controls, self.sort, *SORTS)
+        sort_menu.config(bg=BGC, fg=FGC, highlightthickness=0)
+        sort_menu.pack(side=tk.LEFT)
+        tk.Label(controls, text="Max length", bg=BGC, fg=FGC).pack(side=tk.LEFT)
+        tk.Entry(controls, textvariable=self.max_length, width=3,
+                 bg=BGC, fg=FGC).pack(side=tk.LEFT)
+        tk.Label(controls, text="Starts", bg=BGC, fg=FGC).pack(side=tk.LEFT)
+        tk.Entry(controls, textvariable=self.first_letter, width=3,
+                 bg=BGC, fg=FGC).pack(side=tk.LEFT)
+        tk.Label(controls, text="Words", bg=BGC, fg=FGC).pack(side=tk.LEFT)
+        count_menu = tk.OptionMenu(controls, self.word_count, 'Any', '1', '2',
+                                   '3', '4')
+        count_menu.config(bg=BGC, fg=FGC, highlightthickness=0)
+        count_menu.pack(side=tk.LEFT)
+        for variable in (self.sort, self.max_length, self.first_letter,
+                         self.word_count):
+            variable.trace_add('write', self.apply)
+
+        self.scrollbar = tk.Scrollbar(self, bg=FGC, troughcolor=BGC,
+                                      command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox = tk.Listbox(self, height=rows, width=self.WIDTH,
+                                  bg=BGC, fg=FGC, font=("Courier", 10),
+                                  activestyle=tk.NONE)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH)
+        for widget in (self.listbox, self.scrollbar):
+            widget.bind('<MouseWheel>', self.on_wheel)
+            widget.bind('<Button-4>', self.on_wheel)
+            widget.bind('<Button-5>', self.on_wheel)
+        self.listbox.bind('<Prior>', lambda _: self.scroll_to(self.top - self.rows))
+        self.listbox.bind('<Next>', lambda _: self.scroll_to(self.top + self.rows))
+        self.refresh()
+
+    def apply(self, *_):
+        """Sort and filter the view as the controls are set, then go back
+           to the top."""
+        length = self.max_length.get().strip()
+        count = self.word_count.get()
+        self.view.set_sort(self.sort.get())
+        self.view.set_filters(
+            max_length=int(length) if length.isdigit() else None,
+            first_letter=self.first_letter.get().strip()[:1],
+            word_count=int(count) if count.isdigit() else None)
+        self.top = 0
+        self.refresh()
+
+    def refresh(self, follow=False):
+        """Draw the rows in sight. With follow, stay at the end of the list
+           if it was there, as the pairs found are added to it."""
+        total = len(self.view)
+        last_top = max(0, total - self.rows)
+        if follow and self.at_end and self.view.sort == 'found':
+            self.top = last_top
+        self.top = min(max(self.top, 0), last_top)
+        self.at_end = self.top == last_top
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *self.view.rows(self.top, self.rows))
+        if total > self.rows:
+            self.scrollbar.set(self.top / total, (self.top + self.rows) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, top):
+        """Show the rows from top."""
+        self.top = top
+        self.refresh()
+
+    def on_scroll(self, action, amount, unit=None):
+        """Move the rows in sight as the scrollbar is used."""
+        if action == 'moveto':
+            self.scroll_to(round(float(amount) * len(self.view)))
+        elif action == 'scroll':
+            step = self.rows if unit == 'pages' else 1
+            self.scroll_to(self.top + int(amount) * step)
+
+    def on_wheel(self, event):
+        """Move three rows for each turn of the mouse wheel."""
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.top - 3)
+        else:
+            self.scroll_to(self.top + 3)
+        return 'break'
+
+
 class HintSubForm(tk.Frame):
     """ Hints for the user """
 
-    def __init__(self, master, first_word, second_word):
+    def __init__(self, master, first_word, *other_words):
         super().__init__(master)
 
         self.hint_instruction = "Click and hold below for a hint."  # Default message
@@ -270,15 +442,17 @@ class HintSubForm(tk.Frame):
         self.display_label.pack()
         self.master.configure(bg=BGC)
         self.first_word = first_word
-        self.second_word = second_word
+        self.other_words = other_words
 
         self.labels = [
             ('First letter of first word', self.first_word[0]),
-            ('Second Letter of first word', self.first_word[1]),
-            ('Joining Letter', self.first_word[-1]),
-            ('Length of first word', len(self.first_word)),
-            ('Length of second word', len(self.second_word))
+            ('Second Letter of first word', self.first_word[1])
         ]
+        if self.other_words:
+            self.labels.append(('Joining Letter', self.first_word[-1]))
+        ordinals = ['first', 'second', 'third', 'fourth']
+        for ordinal, word in zip(ordinals, (first_word, *other_words)):
+            self.labels.append((f'Length of {ordinal} word', len(word)))
 
         for text, answer in self.labels:
             button = tk.Button(self,
@@ -0,0 +1,470 @@
+"""Prefix trees (tries) of the dictionary words for the solver.
+
+A Trie is built in memory from the words. A CompiledLexicon is the same
+tree written to a binary file and read through mmap, so it loads without
+creating an object for each word and the pages are shared by every process
+that maps the file. load_lexicon keeps the compiled file up to date with
+the dictionary text file.
+
+Each word also keeps the date it was first seen in the dictionary. A
+DateIndex holds those dates by word id, and the between, known_on and
+first_seen_within views of a lexicon hide the words outside some dates,
+so a box can be solved with the dictionary as it was on any day."""
+import hashlib
+import mmap
+import os
+import struct
+from abc import ABC, abstractmethod
+from array import array
+from string import ascii_lowercase
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from tempfile import gettempdir
+
+CACHE_DIR = os.path.join(gettempdir(), "LetterBoxed")
+
+# magic, version, node count, source size, source mtime, source sha256,
+# word count, date count
+HEADER = struct.Struct('<4sIIQq32sII')
+MAGIC = b'LBXL'
+VERSION = 2
+IS_WORD = 0x80  # Set in a node's child count when the node ends a word.
+NO_WORD = 0xFFFFFFFF  # The word id of a node that doesn't end a word.
+UNDATED = ''  # The date of a word that has none, before every other date.
+MASKS_KEPT = 64  # Date masks a DateIndex keeps for reuse.
+
+
+class DateIndex:
+    """The date each word was first seen, by word id. The dates are kept
+       once each, in order, and each word has the number of its date.
+       A mask of the words first seen between two dates is a bytearray
+       with a 1 for each of those words, made once and kept."""
+
+    def __init__(self, dates: list[str], first_seen):
+        self.dates = dates
+        self.first_seen = first_seen
+        self._masks: dict[tuple[str | None, str | None], bytearray] = {}
+
+    def __len__(self) -> int:
+        return len(self.first_seen)
+
+    @property
+    def latest(self) -> str | None:
+        """The last date a word was first seen on."""
+        return self.dates[-1] if self.dates else None
+
+    def mask(self, first: str | None = None,
+             last: str | None = None) -> bytearray:
+        """The words first seen from the first date to the last, both
+           included. None leaves that end open."""
+        key = (first, last)
+        mask = self._masks.get(key)
+        if mask is None:
+            low = 0 if first is None else bisect_left(self.dates, first)
+            high = len(self.dates) if last is None else \
+                bisect_right(self.dates, last)
+            mask = bytearray(low <= day < high for day in self.first_seen)
+            if len(self._masks) >= MASKS_KEPT:
+                self._masks.pop(next(iter(self._masks)))
+            self._masks[key] = mask
+        return mask
+
+
+class Lexicon(ABC):
+    """Lookups shared by the lexicons. A node is whatever the lexicon's
+       root, child and is_terminal use to stand for a prefix.
+       The version names the dictionary the lexicon was made from,
+       None if it is not known."""
+    root = None
+    version: str | None = None
+    date_index: DateIndex | None = None
+
+    @abstractmethod
+    def child(self, node, letter: str):
+        """Return the node for the prefix plus letter, or None."""
+
+    @abstractmethod
+    def is_terminal(self, node) -> bool:
+        """Check if the prefix of the node is a word."""
+
+    def children(self, node, letters: str) -> list[tuple[str, object, bool]]:
+        """Return the children of the node reached by any of the letters,
+           with their nodes and whether they end a word."""
+        found = []
+        for letter in letters:
+            next_node = self.child(node, letter)
+            if next_node is not None:
+                found.append((letter, next_node, self.is_terminal(next_node)))
+        return found
+
+    @abstractmethod
+    def word_id(self, node) -> int | None:
+        """Return the id of the word the node ends, or None."""
+
+    def between(self, first: str | None = None,
+                last: str | None = None) -> 'DatedLexicon':
+        """The lexicon with only the words first seen from the first date
+           to the last. None leaves that end open."""
+        if self.date_index is None:
+            raise ValueError("the lexicon has no dates")
+        return DatedLexicon(self, self.date_index.mask(first, last),
+                            f"{first or ''}..{last or ''}")
+
+    def known_on(self, the_date: str) -> 'DatedLexicon':
+        """The lexicon as it was on a date."""
+        return self.between(None, the_date)
+
+    def first_seen_within(self, days: int,
+                          until: str | None = None) -> 'DatedLexicon':
+        """The words first seen in the days up to and including a date,
+           by default the latest date in the lexicon."""
+        if self.date_index is None:
+            raise ValueError("the lexicon has no dates")
+        until = until or self.date_index.latest
+        first = date.fromisoformat(until) - timedelta(days=days - 1)
+        return self.between(first.isoformat(), until)
+
+    def __contains__(self, word: str) -> bool:
+        return self.is_word(word)
+
+    def find(self, prefix: str):
+        """Return the node at the end of the prefix or None."""
+        node = self.root
+        for letter in prefix:
+            node = self.child(node, letter)
+            if node is None:
+                return None
+        return node
+
+    def is_word(self, word: str) -> bool:
+        """Check if a word is present in the lexicon."""
+        node = self.find(word)
+        return node is not None and self.is_terminal(node)
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Check if there are words starting with the given prefix."""
+        return self.find(prefix) is not None
+
+    def iter_words(self):
+        """Yield the words in the lexicon in sorted order."""
+        stack = [(letter, node, is_word) for letter, node, is_word
+                 in reversed(self.children(self.root, ascii_lowercase))]
+        while stack:
+            prefix, node, is_word = stack.pop()
+            if is_word:
+                yield prefix
+            stack.extend((prefix + letter, next_node, next_is_word)
+                         for letter, next_node, next_is_word
+                         in reversed(self.children(node, ascii_lowercase)))
+
+
+class DatedLexicon(Lexicon):
+    """A view of a lexicon with only the words in a mask of word ids."""
+
+    def __init__(self, lexicon: Lexicon, mask: bytearray, label: str):
+        self.lexicon = lexicon
+        self.mask = mask
+        self.root = lexicon.root
+        self.date_index = lexicon.date_index
+        self.version = (None if lexicon.version is None
+                        else f"{lexicon.version}@{label}")
+
+    def __len__(self) -> int:
+        return sum(self.mask)
+
+    def child(self, node, letter: str):
+        return self.lexicon.child(node, letter)
+
+    def word_id(self, node) -> int | None:
+        return self.lexicon.word_id(node)
+
+    def is_terminal(self, node) -> bool:
+        word_id = self.lexicon.word_id(node)
+        return word_id is not None and bool(self.mask[word_id])
+
+    def children(self, node, letters: str) -> list[tuple[str, object, bool]]:
+        mask, word_id = self.mask, self.lexicon.word_id
+        return [(letter, next_node, is_word and bool(mask[word_id(next_node)]))
+                for letter, next_node, is_word
+                in self.lexicon.children(node, letters)]
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Check if any of the words in view start with the prefix.
+           The nodes are shared with hidden words, so the words below
+           the prefix are searched until one in view is found."""
+        node = self.find(prefix)
+        if node is None:
+            return False
+        if self.is_terminal(node):
+            return True
+        stack = [node]
+        while stack:
+            for _, next_node, is_word in self.children(stack.pop(),
+                                                       ascii_lowercase):
+                if is_word:
+                    return True
+                stack.append(next_node)
+        return False
+
+
+class TrieNode:
+    """One letter in the trie. Children are keyed by the next letter.
+       A node that ends a word has the word's id, otherwise None."""
+    __slots__ = ('children', 'is_word', 'word_id')
+
+    def __init__(self):
+        self.children: dict[str, TrieNode] = {}
+        self.is_word: bool = False
+        self.word_id: int | None = None
+
+
+class Trie(Lexicon):
+    """Answers "is word" and "has prefix" in time proportional to the
+       length of the word rather than the size of the dictionary."""
+
+    def __init__(self, words=()):
+        self.root = TrieNode()
+        self.word_count = 0
+        self.word_dates: list[str] = []  # The first-seen date by word id.
+        self._date_index = None
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return self.word_count
+
+    def add(self, word: str, first_seen: str = UNDATED) -> None:
+        """Add a word to the trie, keeping the earliest date it was seen."""
+        node = self.root
+        for letter in word:
+            node = node.children.setdefault(letter, TrieNode())
+        if not node.is_word:
+            node.is_word = True
+            node.word_id = self.word_count
+            self.word_dates.append(first_seen)
+            self.word_count += 1
+        elif first_seen < self.word_dates[node.word_id]:
+            self.word_dates[node.word_id] = first_seen
+        self._date_index = None
+
+    @property
+    def date_index(self) -> DateIndex:
+        """The first-seen dates of the words."""
+        if self._date_index is None:
+            dates = sorted(set(self.word_dates))
+            number = {the_date: i for i, the_date in enumerate(dates)}
+            self._date_index = DateIndex(
+                dates, array('H', (number[the_date]
+                                   for the_date in self.word_dates)))
+        return self._date_index
+
+    def child(self, node: TrieNode, letter: str) -> TrieNode | None:
+        return node.children.get(letter)
+
+    def word_id(self, node: TrieNode) -> int | None:
+        return node.word_id
+
+    def is_terminal(self, node: TrieNode) -> bool:
+        return node.is_word
+
+    def children(self, node: TrieNode,
+                 letters: str) -> list[tuple[str, TrieNode, bool]]:
+        children = node.children
+        return [(letter, next_node, next_node.is_word) for letter in letters
+                if (next_node := children.get(letter)) is not None]
+
+
+class CompiledLexicon(Lexicon):
+    """A trie read from a compiled lexicon file through mmap.
+
+       The nodes are numbered in breadth first order, so the children of
+       a node are numbered one after the other. After the header come
+       four arrays indexed by node number: the letter leading to the
+       node, its child count (with IS_WORD set if it ends a word), the
+       number of its first child and the id of the word it ends. Then
+       come the number of each word's first-seen date, by word id, and
+       last the dates, one per line. A node is its number, the root is 0."""
+    root = 0
+
+    def __init__(self, the_file: str):
+        with open(the_file, 'rb') as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.node_count, self.source_size,
+             self.source_mtime_ns, self.source_hash, self.word_count,
+             self.date_count) = HEADER.unpack_from(self._mm)
+        except struct.error:
+            self._mm.close()
+            raise
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{the_file} is not a version {VERSION} lexicon")
+        self.version = self.source_hash.hex()
+        self._labels = HEADER.size
+        counts = self._labels + self.node_count
+        first_child = _aligned(counts + self.node_count)
+        word_ids = first_child + 4 * self.node_count
+        first_seen = word_ids + 4 * self.node_count
+        dates = first_seen + 2 * self.word_count
+        view = memoryview(self._mm)
+        self._counts = view[counts:counts + self.node_count]
+        self._first_child = view[first_child:word_ids].cast('I')
+        self._word_ids = view[word_ids:first_seen].cast('I')
+        self._first_seen = view[first_seen:dates].cast('H')
+        self._dates = self._mm[dates:].decode().split('\n')[:self.date_count]
+        self._date_index = None
+
+    def __len__(self) -> int:
+        return self.word_count
+
+    @property
+    def date_index(self) -> DateIndex:
+        """The first-seen dates of the words, read from the file."""
+        if self._date_index is None:
+            self._date_index = DateIndex(self._dates, self._first_seen)
+        return self._date_index
+
+    def word_id(self, node: int) -> int | None:
+        word_id = self._word_ids[node]
+        return None if word_id == NO_WORD else word_id
+
+    def child(self, node: int, letter: str) -> int | None:
+        start = self._labels + self._first_child[node]
+        end = start + (self._counts[node] & ~IS_WORD)
+        found = self._mm.find(letter.encode(), start, end)
+        return None if found < 0 else found - self._labels
+
+    def is_terminal(self, node: int) -> bool:
+        return bool(self._counts[node] & IS_WORD)
+
+    def children(self, node: int,
+                 letters: str) -> list[tuple[str, int, bool]]:
+        first = self._first_child[node]
+        start = self._labels + first
+        labels = self._mm[start:start + (self._counts[node] & ~IS_WORD)]
+        counts = self._counts
+        return [(letter, first + i, counts[first + i] >= IS_WORD)
+                for i, letter in enumerate(labels.decode()) if letter in letters]
+
+    def close(self) -> None:
+        """Release the mapping of the file."""
+        self._date_index = None
+        for view in (self._counts, self._first_child, self._word_ids,
+                     self._first_seen):
+            view.release()
+        self._mm.close()
+
+
+def _aligned(offset: int) -> int:
+    """Round an offset up to a multiple of 4 for the uint32 array."""
+    return (offset + 3) & ~3
+
+
+def compile_trie(trie: Trie, stamp: tuple[int, int, bytes]) -> bytes:
+    """Lay a trie out as a compiled lexicon file.
+       The stamp is the size, mtime and hash of the source file.
+       The words are numbered again in the order of their nodes."""
+    labels = bytearray([0])
+    counts = bytearray()
+    first_child = array('I')
+    word_ids = array('I')
+    word_dates = []
+    order = [trie.root]
+    for node in order:  # Grows as the children are added.
+        first_child.append(len(order))
+        counts.append(len(node.children) | (IS_WORD if node.is_word else 0))
+        if node.is_word:
+            word_ids.append(len(word_dates))
+            word_dates.append(trie.word_dates[node.word_id])
+        else:
+            word_ids.append(NO_WORD)
+        for letter, kid in sorted(node.children.items()):
+            labels += letter.encode()
+            order.append(kid)
+    dates = sorted(set(word_dates))
+    number = {the_date: i for i, the_date in enumerate(dates)}
+    first_seen = array('H', (number[the_date] for the_date in word_dates))
+    blob = bytearray(HEADER.pack(MAGIC, VERSION, len(order), *stamp,
+                                 len(word_dates), len(dates)))
+    blob += labels + counts
+    blob += bytes(_aligned(len(blob)) - len(blob))
+    blob += first_child.tobytes() + word_ids.tobytes() + first_seen.tobytes()
+    blob += '\n'.join(dates).encode()
+    return bytes(blob)
+
+
+def file_hash(the_file: str) -> bytes:
+    """Return the sha256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(the_file, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def compiled_path(dictionary_file: str, cache_dir: str = CACHE_DIR) -> str:
+    """Where the compiled lexicon of a dictionary file is kept."""
+    name = os.path.splitext(os.path.basename(dictionary_file))[0]
+    where = hashlib.sha1(os.path.abspath(dictionary_file).encode()).hexdigest()
+    return os.path.join(cache_dir, f"{name}-{where[:8]}.lexicon")
+
+
+def load_lexicon(dictionary_file: str, cache_dir: str = CACHE_DIR) -> Lexicon:
+    """Map the compiled lexicon for a dictionary file, compiling it first
+       if the dictionary's size, mtime or hash has changed since."""
+    lexicon_file = compiled_path(dictionary_file, cache_dir)
+    stat = os.stat(dictionary_file)
+    try:
+        lexicon = CompiledLexicon(lexicon_file)
+    except (OSError, ValueError, struct.error):
+        lexicon = None
+    if lexicon is not None:
+        if (lexicon.source_size, lexicon.source_mtime_ns) == (
+                stat.st_size, stat.st_mtime_ns):
+            return lexicon
+        digest = file_hash(dictionary_file)
+        if lexicon.source_hash == digest:
+            # Only touched, so record the new size and mtime.
+            lexicon.close()
+            with open(lexicon_file, 'r+b') as file:
+                file.write(HEADER.pack(MAGIC, VERSION, lexicon.node_count,
+                                       stat.st_size, stat.st_mtime_ns, digest,
+                                       lexicon.word_count, lexicon.date_count))
+            return CompiledLexicon(lexicon_file)
+        lexicon.close()
+    else:
+        digest = file_hash(dictionary_file)
+    trie = Trie()
+    for word, first_seen in load_dated_words(dictionary_file):
+        trie.add(word, first_seen)
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_file = f"{lexicon_file}.{os.getpid()}.tmp"
+    with open(temp_file, 'wb') as file:
+        file.write(compile_trie(
+            trie, (stat.st_size, stat.st_mtime_ns, digest)))
+    try:
+        os.replace(temp_file, lexicon_file)
+    except PermissionError:
+        # Another process has the old file mapped (Windows). Use the
+        # trie for now, the file is compiled again on a later start.
+        os.remove(temp_file)
+        return trie
+    return CompiledLexicon(lexicon_file)
+
+
+def load_words(dictionary_file: str) -> list[str]:
+    """Read the dictionary file and return the words without the dates."""
+    with open(dictionary_file, 'r', encoding='UTF-8') as file:
+        return [line.split('\t')[0].strip() for line in file if line.strip()]
+
+
+def load_dated_words(dictionary_file: str) -> list[tuple[str, str]]:
+    """Read the dictionary file and return each word with the date it was
+       first seen, UNDATED if the line has none."""
+    dated_words = []
+    with open(dictionary_file, 'r', encoding='UTF-8') as file:
+        for line in file:
+            word, _, first_seen = line.strip().partition('\t')
+            if word:
+                dated_words.append((word.strip(), first_seen.strip()))
+    return dated_words
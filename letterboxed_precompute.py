@@ -0,0 +1,149 @@
+"""Narrow the dictionary to the words a box could use while it is typed in.
+
+The box is an assignment of letters to its twelve places, with '' for a
+place not filled in yet. A word can still be used if the letters it has
+that are not in the box yet could fit in the empty places, and no two
+letters next to each other in it are on the same side. Each letter typed
+narrows the words left from the assignment before it, so by the twelfth
+letter the words are those the solver would find. The words for each
+assignment are kept, and changing a letter starts again from the
+assignment without it, so only the work that letter affected is redone.
+A Precomputer does this on a worker thread as the letters are typed.
+Given the features file of the dictionary, the words and masks to start
+from are taken from it rather than worked out from the lexicon."""
+import threading
+from collections import OrderedDict
+
+from letterboxed import LETTERS_ON_SIDE, SIDES, Solver
+from word_features import WordFeatures
+
+PLACES = SIDES * LETTERS_ON_SIDE
+STATES_KEPT = 64  # Assignments whose words are kept.
+
+
+def letter_mask(word: str) -> int:
+    """A bit for each letter a to z in the word."""
+    mask = 0
+    for letter in word:
+        mask |= 1 << (ord(letter) - ord('a'))
+    return mask
+
+
+def usable(word: str) -> bool:
+    """Whether the word could be in any box: letters a to z, at least two
+       of them, no more than the box has and no letter twice in a row."""
+    return (len(word) > 1 and word.isascii() and word.isalpha()
+            and word.islower() and len(set(word)) <= PLACES
+            and not any(a == b for a, b in zip(word, word[1:])))
+
+
+def narrow(words: list[str], masks: list[int], assignment: tuple[str, ...],
+           place: int) -> tuple[list[str], list[int]]:
+    """Keep the words that can still be used once the letter at the
+       place has been filled in. The words were those for the assignment
+       without it."""
+    letter = assignment[place]
+    side = place // LETTERS_ON_SIDE
+    neighbours = [other for other in
+                  assignment[side * LETTERS_ON_SIDE:(side + 1) * LETTERS_ON_SIDE]
+                  if other and other != letter]
+    # Letters on the same side can't be next to each other in a word.
+    banned = [letter + other for other in neighbours] + \
+             [other + letter for other in neighbours]
+    known = letter_mask(''.join(assignment))
+    empty = assignment.count('')
+    bit = letter_mask(letter)
+    kept_words, kept_masks = [], []
+    for word, mask in zip(words, masks):
+        if (mask & ~known).bit_count() > empty:
+            continue
+        if mask & bit and any(pair in word for pair in banned):
+            continue
+        kept_words.append(word)
+        kept_masks.append(mask)
+    return kept_words, kept_masks
+
+
+class Precomputer:
+    """Works out the words for the box on a worker thread as it is typed.
+       update is given each new assignment, and words_for returns the
+       words for the finished box, from what has been worked out so far."""
+
+    def __init__(self, solver: Solver, features: WordFeatures | None = None):
+        self.solver = solver
+        self.features = features
+        self.base: tuple[list[str], list[int]] | None = None
+        self.states: OrderedDict[tuple[str, ...], tuple[list[str], list[int]]] = \
+            OrderedDict()
+        self.lock = threading.Lock()
+        self.changed = threading.Event()
+        self.wanted: tuple[str, ...] | None = ('',) * PLACES
+        self.closed = False
+        self.changed.set()  # Start on the whole dictionary straight away.
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def update(self, assignment) -> None:
+        """Start on the words for a new assignment, dropping any not
+           started yet."""
+        self.wanted = tuple(letter.lower() for letter in assignment)
+        self.changed.set()
+
+    def close(self) -> None:
+        """Stop the worker thread."""
+        self.closed = True
+        self.changed.set()
+
+    def run(self) -> None:
+        """Work out the words for the latest assignment given."""
+        while True:
+            self.changed.wait()
+            self.changed.clear()
+            if self.closed:
+                return
+            assignment = self.wanted
+            with self.lock:
+                self.candidates(assignment)
+
+    def candidates(self, assignment: tuple[str, ...]) -> tuple[list[str], list[int]]:
+        """The words and masks for an assignment, narrowed from a kept
+           assignment with one letter fewer. Call with the lock held."""
+        filled = [place for place, letter in enumerate(assignment) if letter]
+        if not filled:
+            if self.base is None:
+                self.base = self.all_words()
+            return self.base
+        state = self.states.get(assignment)
+        if state is not None:
+            self.states.move_to_end(assignment)
+            return state
+        # Start from an assignment that is kept if there is one,
+        # otherwise from the one without the last letter.
+        place = next((place for place in filled if self.without(
+            assignment, place) in self.states), filled[-1])
+        words, masks = self.candidates(self.without(assignment, place))
+        state = narrow(words, masks, assignment, place)
+        self.states[assignment] = state
+        while len(self.states) > STATES_KEPT:
+            self.states.popitem(last=False)
+        return state
+
+    def all_words(self) -> tuple[list[str], list[int]]:
+        """The words that could be in any box, and their masks."""
+        features = self.features
+        if features is not None and features.version == self.solver.lexicon.version:
+            kept = features.playable(PLACES)
+            return ([features.words[i] for i in kept],
+                    [features.masks[i] for i in kept])
+        words = [word for word in self.solver.lexicon.iter_words() if usable(word)]
+        return words, [letter_mask(word) for word in words]
+
+    @staticmethod
+    def without(assignment: tuple[str, ...], place: int) -> tuple[str, ...]:
+        """The assignment with the place emptied."""
+        return assignment[:place] + ('',) + assignment[place + 1:]
+
+    def words_for(self, letter_box: list[str]) -> list[str]:
+        """The words for a finished box, in sorted order."""
+        assignment = tuple(''.join(letter_box).lower())
+        with self.lock:
+            return list(self.candidates(assignment)[0])
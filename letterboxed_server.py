@@ -0,0 +1,160 @@
+"""Serve solves over HTTP as JSON from one warm lexicon.
+
+    python letterboxed_server.py --port 8765
+    GET  /solve?sides=abc,def,ghi,jkl
+    POST /solve  {"sides": ["abc", "def", "ghi", "jkl"]}
+
+The reply has the sides, their signature, the words, the pairs and the
+best pair. Results are kept in a bounded LRU cache that is emptied, and
+the lexicon reloaded, when the dictionary file changes. The server binds
+to localhost unless told otherwise."""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from letterboxed import Solver, check_sides, dictionary_file
+from letterboxed_lexicon import CACHE_DIR, load_lexicon
+
+HOST = "127.0.0.1"
+PORT = 8765
+CACHE_SIZE = 256       # Results kept in the cache.
+CHECK_INTERVAL = 1.0   # Seconds between checks of the dictionary file.
+
+
+class SolveService:
+    """One solver shared by the request threads, with an LRU cache of
+       results keyed by the sides. Both are replaced when the size or
+       mtime of the dictionary file changes. The dictionary is compiled
+       into cache_dir."""
+
+    def __init__(self, the_file: str, cache_size: int = CACHE_SIZE,
+                 cache_dir: str = CACHE_DIR):
+        self.the_file = the_file
+        self.cache_size = cache_size
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.cache: OrderedDict[tuple[str, ...], dict] = OrderedDict()
+        self.stamp = None
+        self.checked = 0.0
+        self.solver = None
+        self.current_solver()
+
+    def current_solver(self) -> Solver:
+        """Return the solver, reloading it if the dictionary has changed."""
+        with self.lock:
+            now = time.monotonic()
+            if self.solver is None or now - self.checked >= CHECK_INTERVAL:
+                self.checked = now
+                stat = os.stat(self.the_file)
+                stamp = (stat.st_size, stat.st_mtime_ns)
+                if stamp != self.stamp:
+                    self.solver = Solver(load_lexicon(self.the_file,
+                                                      self.cache_dir))
+                    self.cache.clear()
+                    self.stamp = stamp
+            return self.solver
+
+    def solve(self, sides: list[str]) -> dict:
+        """Return the results for the sides, from the cache if there."""
+        sides = check_sides(sides)
+        key = tuple(sides)
+        solver = self.current_solver()
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return {**self.cache[key], 'cached': True}
+        # Solve without the lock so requests for other boxes can run.
+        words, pairs = solver.solve(sides)
+        result = {'sides': sides,
+                  'signature': ''.join(sorted(''.join(sides))),
+                  'words': words,
+                  'pairs': [list(pair) for pair in pairs],
+                  'best': list(pairs[0]) if pairs else []}
+        with self.lock:
+            if solver is self.solver:
+                self.cache[key] = result
+                self.cache.move_to_end(key)
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        return {**result, 'cached': False}
+
+
+class SolveHandler(BaseHTTPRequestHandler):
+    """Answer /solve requests from the server's SolveService."""
+    server_version = "LetterBoxed/1.0"
+
+    def send_json(self, status: int, body: dict) -> None:
+        """Send a JSON reply."""
+        data = json.dumps(body).encode('UTF-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def answer(self, sides) -> None:
+        """Solve the sides and send the results or the error."""
+        try:
+            self.send_json(200, self.server.service.solve(sides))
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+
+    def do_GET(self):
+        """GET /solve?sides=abc,def,ghi,jkl"""
+        url = urlparse(self.path)
+        if url.path != '/solve':
+            self.send_json(404, {'error': "not found"})
+            return
+        sides = parse_qs(url.query).get('sides', [''])[0]
+        self.answer(sides.split(','))
+
+    def do_POST(self):
+        """POST /solve with {"sides": [...]}"""
+        if urlparse(self.path).path != '/solve':
+            self.send_json(404, {'error': "not found"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self.send_json(400, {'error': "the body is not JSON"})
+            return
+        self.answer(body.get('sides') if isinstance(body, dict) else None)
+
+
+def make_server(host: str = HOST, port: int = PORT,
+                the_file: str = dictionary_file,
+                cache_size: int = CACHE_SIZE,
+                cache_dir: str = CACHE_DIR) -> ThreadingHTTPServer:
+    """Create the server. Port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), SolveHandler)
+    server.daemon_threads = True
+    server.service = SolveService(the_file, cache_size, cache_dir)
+    return server
+
+
+def main(argv=None) -> None:
+    """Run the server until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--dictionary', default=dictionary_file)
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE)
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port, args.dictionary, args.cache_size)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}/solve")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Find the words for a letter box with NumPy array operations.
+
+The whole word list is encoded once as a padded uint8 array. A box then
+selects its words in a few bulk operations instead of a letter by letter
+search, giving the same words as letterboxed.Solver.find_words."""
+import sys
+import time
+
+import numpy as np
+
+from letterboxed_lexicon import load_words
+
+PAD = 0          # Byte used to pad the words to the same length.
+PAD_SIDE = -1    # Side given to the padding. Never matches a real side.
+NOT_IN_BOX = -2  # Side given to letters that are not in the box.
+
+
+class EncodedWords:
+    """The dictionary words as rows of ASCII codes,
+       padded with zeros to the length of the longest word."""
+
+    def __init__(self, words: list[str]):
+        self.words = np.array(words, dtype=object)
+        longest = max((len(word) for word in words), default=0)
+        text = ''.join(word.ljust(longest, chr(PAD)) for word in words)
+        self.codes = np.frombuffer(
+            text.encode('ascii', 'replace'), dtype=np.uint8).reshape(
+                len(words), longest)
+        # A bit for each letter a to z used in the word, to drop the words
+        # with letters that are not in the box before looking at the sides.
+        bits = np.zeros(256, dtype=np.uint32)
+        bits[ord('a'):ord('z') + 1] = 1 << np.arange(26, dtype=np.uint32)
+        self.letter_masks = np.bitwise_or.reduce(bits[self.codes], axis=1)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+def side_table(letter_box: list[str]) -> np.ndarray:
+    """ For each byte say which side of the box the letter is on """
+    table = np.full(256, NOT_IN_BOX, dtype=np.int8)
+    table[PAD] = PAD_SIDE
+    for side, letters in enumerate(letter_box):
+        for letter in letters:
+            table[ord(letter)] = side
+    return table
+
+
+def find_words(letter_box: list[str], encoded: EncodedWords) -> list[str]:
+    """ Find the words of two or more letters that use only the letters
+        of the box and never put two letters from the same side next to
+        each other. """
+    box_mask = sum(1 << (ord(letter) - ord('a'))
+                   for letter in set(''.join(letter_box)))
+    if encoded.codes.shape[1] < 2:
+        return []
+    rows = np.flatnonzero(((encoded.letter_masks & ~np.uint32(box_mask)) == 0)
+                          & (encoded.codes[:, 1] != PAD))
+    codes = encoded.codes[rows]
+    sides = side_table(letter_box)[codes]
+    in_box = (sides != NOT_IN_BOX).all(axis=1)
+    same_side = ((sides[:, 1:] == sides[:, :-1])
+                 & (codes[:, 1:] != PAD)).any(axis=1)
+    return encoded.words[rows[in_box & ~same_side]].tolist()
+
+
+if __name__ == "__main__":
+    # python letterboxed_vector.py daily_dictionaries.txt abc def ghi jkl
+    start = time.perf_counter()
+    encoded_words = EncodedWords(load_words(sys.argv[1]))
+    print(f"Encoded {len(encoded_words):,d} words in "
+          f"{time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    found = find_words(sys.argv[2:6], encoded_words)
+    print(f"Found {len(found):,d} words in {time.perf_counter() - start:.4f}s")
@@ -0,0 +1,92 @@
+"""The pairs of a solve, sorted and filtered for display a page at a time.
+
+A PairView keeps the pairs as they were found and a list of the ones to
+show, in the order chosen. Changing the sort or the filters works out that
+list again from the pairs, without another search. rows returns the text
+of just the rows asked for, so showing a page costs the same however many
+pairs there are."""
+from letterboxed import solution_rank
+
+SORTS = {
+    'best': solution_rank,
+    'length': lambda pair: (len(''.join(pair)), pair),
+    'a to z': lambda pair: pair,
+    'found': None,  # The order the pairs were found in.
+}
+
+
+def pair_text(pair: tuple[str, ...]) -> str:
+    """A pair as a row of the list: its length, then its words."""
+    return f"{len(''.join(pair))}: {' '.join(pair)}"
+
+
+class PairView:
+    """The pairs to show, sorted and filtered."""
+
+    def __init__(self, pairs=(), sort: str = 'found'):
+        self.pairs: list[tuple[str, ...]] = []
+        self.sort = sort
+        self.max_length: int | None = None
+        self.first_letter = ''
+        self.word_count: int | None = None
+        self.shown: list[int] | None = []  # Indexes into pairs, None if stale.
+        self.extend(pairs)
+
+    def __len__(self) -> int:
+        return len(self.visible())
+
+    def keep(self, pair: tuple[str, ...]) -> bool:
+        """Whether the pair passes the filters."""
+        return ((self.max_length is None
+                 or len(''.join(pair)) <= self.max_length)
+                and pair[0].startswith(self.first_letter)
+                and (self.word_count is None or len(pair) == self.word_count))
+
+    def extend(self, new_pairs) -> None:
+        """Add pairs as they are found."""
+        start = len(self.pairs)
+        self.pairs.extend(tuple(pair) for pair in new_pairs)
+        if self.shown is not None and self.sort == 'found':
+            # Found order, so the new pairs go on the end.
+            self.shown.extend(i for i in range(start, len(self.pairs))
+                              if self.keep(self.pairs[i]))
+        else:
+            self.shown = None
+
+    def set_pairs(self, pairs) -> None:
+        """Replace the pairs with the final ones."""
+        self.pairs = []
+        self.shown = []
+        self.extend(pairs)
+
+    def set_sort(self, sort: str) -> None:
+        """Sort by one of SORTS."""
+        if sort not in SORTS:
+            raise ValueError(f"unknown sort {sort!r}")
+        self.sort = sort
+        self.shown = None
+
+    def set_filters(self, max_length: int | None = None, first_letter: str = '',
+                    word_count: int | None = None) -> None:
+        """Show only the pairs of at most max_length letters, with a first
+           word starting with first_letter and of word_count words.
+           None or '' leaves a filter off."""
+        self.max_length = max_length
+        self.first_letter = first_letter.lower()
+        self.word_count = word_count
+        self.shown = None
+
+    def visible(self) -> list[int]:
+        """The indexes of the pairs to show, in order."""
+        if self.shown is None:
+            shown = [i for i, pair in enumerate(self.pairs) if self.keep(pair)]
+            key = SORTS[self.sort]
+            if key is not None:
+                shown.sort(key=lambda i: key(self.pairs[i]))
+            self.shown = shown
+        return self.shown
+
+    def rows(self, start: int, count: int) -> list[str]:
+        """The text of count rows from start."""
+        pairs = self.pairs
+        return [pair_text(pairs[i]) for i in self.visible()[start:start + count]]
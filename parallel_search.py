@@ -0,0 +1,68 @@
+"""Find a box's words on a pool of processes, a starting letter to each.
+
+The words starting with each of the twelve letters are found apart from
+the others, so the letters are shared out over the pool. Each worker
+process loads the dictionary once with load_lexicon, which maps the
+compiled lexicon the parent has already compiled, so the workers share
+its pages rather than each having a copy. The words come back for each
+letter and are put together in box order, which is the order the search
+on one process finds them in, so the words are the same either way.
+
+    with ParallelSolver(dictionary_file, workers=4) as solver:
+        words, pairs = solver.solve(['abc', 'def', 'ghi', 'jkl'])
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from letterboxed import Solver, SolveStats, init_worker, worker_solver
+from letterboxed_lexicon import CACHE_DIR, load_lexicon
+from result_cache import ResultCache
+
+
+def words_starting(letter_box: list[str], start: str
+                   ) -> tuple[list[str], tuple[int, int, int]]:
+    """The words for the box that start with the letter, and the nodes
+       expanded, prefix probes and membership checks that found them."""
+    stats = SolveStats()
+    words = worker_solver().find_words(letter_box, stats, starts=start)
+    return words, (stats.nodes_expanded, stats.prefix_probes,
+                   stats.membership_checks)
+
+
+class ParallelSolver(Solver):
+    """A solver that finds the words on a pool of processes. Close it,
+       or use it in a with block, to stop the pool."""
+
+    def __init__(self, the_file: str, cache: ResultCache | None = None,
+                 workers: int | None = None, cache_dir: str = CACHE_DIR):
+        # Compiled here first, so the workers only map it.
+        super().__init__(load_lexicon(the_file, cache_dir), cache)
+        self.pool = ProcessPoolExecutor(workers or os.cpu_count(),
+                                        initializer=init_worker,
+                                        initargs=(the_file, cache_dir))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self.pool.shutdown(cancel_futures=True)
+
+    def find_words(self, letter_box: list[str], stats: SolveStats | None = None,
+                   starts: str | None = None) -> list[str]:
+        """Find the words of each starting letter on the pool and put them
+           together in box order."""
+        letters = [letter for letter in dict.fromkeys(''.join(letter_box))
+                   if starts is None or letter in starts]
+        words = []
+        for part, (nodes, probes, checks) in self.pool.map(
+                words_starting, [letter_box] * len(letters), letters):
+            words.extend(part)
+            if stats is not None:
+                stats.nodes_expanded += nodes
+                stats.prefix_probes += probes
+                stats.membership_checks += checks
+        return words
@@ -0,0 +1,97 @@
+"""A size-bounded cache on disk of the words and pairs for each box.
+
+A box's results depend only on its letters and which letters share a
+side, not on the order of the sides or of the letters on them. The cache
+is keyed by a canonical form of the box, the sides each sorted and then
+sorted among themselves, together with the version of the dictionary.
+Each entry is a JSON file. Reading one touches it, and the least recently
+used files are removed when the total size goes over the limit."""
+import hashlib
+import json
+import os
+import threading
+
+from letterboxed_lexicon import CACHE_DIR
+
+RESULTS_DIR = os.path.join(CACHE_DIR, "results")
+MAX_BYTES = 64 * 1024 * 1024
+
+
+def canonical_box(letter_box: list[str]) -> str:
+    """The same string for every ordering of the sides and their letters."""
+    return '-'.join(sorted(''.join(sorted(side)) for side in letter_box))
+
+
+class ResultCache:
+    """Words and pairs for boxes, kept in files in a directory."""
+
+    def __init__(self, cache_dir: str = RESULTS_DIR, max_bytes: int = MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def path(self, letter_box: list[str], version: str) -> str:
+        """The file for a box and dictionary version."""
+        key = f"{version}:{canonical_box(letter_box)}"
+        return os.path.join(self.cache_dir,
+                            hashlib.sha1(key.encode()).hexdigest() + '.json')
+
+    def get(self, letter_box: list[str], version: str
+            ) -> tuple[list[str], list[tuple[str, ...]]] | None:
+        """Return the words and pairs for the box, or None."""
+        the_file = self.path(letter_box, version)
+        try:
+            with open(the_file, 'r', encoding='UTF-8') as file:
+                entry = json.load(file)
+            os.utime(the_file)  # Now the most recently used.
+        except (OSError, ValueError):
+            return None
+        if entry.get('box') != canonical_box(letter_box) or \
+                entry.get('version') != version:
+            return None
+        return entry['words'], [tuple(pair) for pair in entry['pairs']]
+
+    def put(self, letter_box: list[str], version: str, words: list[str],
+            pairs: list[tuple[str, ...]]) -> None:
+        """Save the results for the box, then trim the cache to size.
+           A cache that can't be written to is skipped, as the results
+           are only kept to save time later."""
+        the_file = self.path(letter_box, version)
+        # Each thread has its own temp file, as two may store the same box.
+        temp_file = f"{the_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_file, 'w', encoding='UTF-8') as file:
+                json.dump({'box': canonical_box(letter_box), 'version': version,
+                           'words': words, 'pairs': pairs}, file)
+            os.replace(temp_file, the_file)
+        except OSError:
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used files until under the limit."""
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir)
+                       if entry.name.endswith('.json')]
+        except OSError:
+            return
+        stats = []
+        for entry in entries:
+            try:
+                stats.append((entry.stat().st_mtime_ns, entry.stat().st_size,
+                              entry.path))
+            except OSError:
+                continue  # Removed by another process.
+        total = sum(size for _, size, _ in stats)
+        for _, size, the_file in sorted(stats):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(the_file)
+            except OSError:
+                pass
+            total -= size
@@ -0,0 +1,140 @@
+"""Local copies of the files on the network share, kept up to date.
+
+Reading the dictionary and solutions straight from the share is slow over
+SMB or a VPN. A ShareCache keeps a copy of each file in the user's temp
+directory, with the share file's size, mtime and sha256 beside it. A
+refresh looks at the share file's size and mtime first, which is one stat
+over the network. If they haven't changed the copy is used as it is. If
+they have, the file is read and hashed, and the copy only replaced if the
+contents have changed, so a new day's import is seen.
+
+The refresh runs on a worker thread. fetch waits for it for a short time
+and then uses the copy as it is, leaving the thread to finish in the
+background, so a share that is slow or can't be reached doesn't hold up
+the start. Only when there is no copy yet does fetch wait for the share."""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+from letterboxed_lexicon import CACHE_DIR
+
+SHARE_CACHE_DIR = os.path.join(CACHE_DIR, "share")
+CHUNK_SIZE = 1 << 20  # Bytes copied at a time.
+TIMEOUT = 1.0         # Seconds to wait for the share before using a copy.
+
+
+class Refresh(threading.Thread):
+    """A refresh of one share file on a worker thread. The error is the
+       OSError it raised, if it did."""
+
+    def __init__(self, cache: 'ShareCache', share_file: str):
+        super().__init__(daemon=True)
+        self.cache = cache
+        self.share_file = share_file
+        self.started = time.monotonic()
+        self.error: OSError | None = None
+
+    def run(self):
+        try:
+            self.cache.refresh(self.share_file)
+        except OSError as e:
+            self.error = e
+
+
+class ShareCache:
+    """Copies of share files, kept in a directory."""
+
+    def __init__(self, cache_dir: str = SHARE_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.refreshes: dict[str, Refresh] = {}
+
+    def path(self, share_file: str) -> str:
+        """The copy of a share file."""
+        name, extension = os.path.splitext(os.path.basename(share_file))
+        where = hashlib.sha1(os.path.abspath(share_file).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}-{where[:8]}{extension}")
+
+    def stamp(self, share_file: str) -> dict | None:
+        """The size, mtime and hash of the share file when last copied."""
+        try:
+            with open(self.path(share_file) + '.json', 'r', encoding='UTF-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def save_stamp(self, share_file: str, stamp: dict) -> None:
+        """Record the size, mtime and hash of the share file."""
+        the_file = self.path(share_file) + '.json'
+        temp_file = f"{the_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_file, 'w', encoding='UTF-8') as file:
+            json.dump(stamp, file)
+        os.replace(temp_file, the_file)
+
+    def refresh(self, share_file: str) -> bool:
+        """Copy the share file if it has changed since it was last copied.
+           Return whether the copy was replaced. Raises OSError if the
+           share can't be read."""
+        local_file = self.path(share_file)
+        stat = os.stat(share_file)
+        stamp = self.stamp(share_file)
+        if stamp is not None and os.path.exists(local_file) and \
+                (stamp['size'], stamp['mtime_ns']) == (stat.st_size,
+                                                       stat.st_mtime_ns):
+            return False
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_file = f"{local_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        digest = hashlib.sha256()
+        try:
+            with open(share_file, 'rb') as source, \
+                    open(temp_file, 'wb') as copy:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    copy.write(chunk)
+            changed = stamp is None or not os.path.exists(local_file) \
+                or stamp.get('sha256') != digest.hexdigest()
+            if changed:
+                # Otherwise it was only touched, and the copy is left as
+                # it is so what was worked out from it stays current.
+                shutil.copystat(share_file, temp_file)
+                os.replace(temp_file, local_file)
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+        self.save_stamp(share_file, {'size': stat.st_size,
+                                     'mtime_ns': stat.st_mtime_ns,
+                                     'sha256': digest.hexdigest()})
+        return changed
+
+    def start(self, share_file: str) -> Refresh:
+        """Start refreshing the share file on a worker thread, unless it
+           has been started and not yet fetched. Starting each file before
+           fetching any checks them all at the same time."""
+        with self.lock:
+            refresh = self.refreshes.get(share_file)
+            if refresh is None:
+                refresh = self.refreshes[share_file] = Refresh(self, share_file)
+                refresh.start()
+            return refresh
+
+    def fetch(self, share_file: str, timeout: float = TIMEOUT) -> str:
+        """The copy of the share file, refreshed if that is done within the
+           timeout from when the refresh started. Otherwise the copy as it
+           is, and the refresh goes on in the background. With no copy yet
+           the refresh is waited for. Raises OSError if the share can't
+           be read and there is no copy."""
+        local_file = self.path(share_file)
+        refresh = self.start(share_file)
+        if os.path.exists(local_file):
+            refresh.join(max(0.0, refresh.started + timeout - time.monotonic()))
+        else:
+            refresh.join()
+        with self.lock:
+            if not refresh.is_alive() and self.refreshes.get(share_file) is refresh:
+                del self.refreshes[share_file]
+        if refresh.error is not None and not os.path.exists(local_file):
+            raise refresh.error
+        return local_file
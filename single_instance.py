@@ -0,0 +1,105 @@
+"""Keep one copy of LetterBoxed running and pass later launches to it.
+
+The running copy listens on a localhost socket and writes the port, with
+a token to check callers by, to a file in the temp directory. A later
+launch reads the file and sends its puzzle, and the running copy, which
+has the dictionary loaded, solves it. If nothing answers on the port the
+copy that wrote the file has gone, crashed or not, so the new launch
+takes over and writes the file again. Nothing is left to lock later
+launches out."""
+import json
+import os
+import queue
+import secrets
+import socket
+import threading
+from tempfile import gettempdir
+
+INSTANCE_DIR = os.path.join(gettempdir(), "LetterBoxed")
+INSTANCE_FILE = os.path.join(INSTANCE_DIR, "instance.json")
+HOST = '127.0.0.1'
+TIMEOUT = 2.0          # Seconds to wait for the running copy to answer.
+MAX_MESSAGE = 4096     # Bytes read from a caller.
+
+
+def read_instance(the_file: str = INSTANCE_FILE) -> dict | None:
+    """The port and token of the running copy, or None if there is no file."""
+    try:
+        with open(the_file, 'r', encoding='UTF-8') as file:
+            instance = json.load(file)
+        return instance if {'port', 'token'} <= instance.keys() else None
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def hand_off(sides: list[str], the_file: str = INSTANCE_FILE,
+             timeout: float = TIMEOUT) -> bool:
+    """Pass the sides to the running copy, or no sides to just bring it to
+       the front. Return False if no copy answered."""
+    instance = read_instance(the_file)
+    if instance is None:
+        return False
+    message = json.dumps({'token': instance['token'], 'sides': sides}) + '\n'
+    try:
+        with socket.create_connection((HOST, instance['port']),
+                                      timeout=timeout) as connection:
+            connection.sendall(message.encode('UTF-8'))
+            return connection.recv(16).startswith(b'ok')
+    except (OSError, TypeError, OverflowError):
+        return False  # Gone, or the port is not a port.
+
+
+class Instance:
+    """The running copy's end. Puzzles sent by later launches are put on
+       the requests queue, as their lists of sides, for the forms to
+       take off."""
+
+    def __init__(self, the_file: str = INSTANCE_FILE):
+        self.the_file = the_file
+        self.token = secrets.token_hex(16)
+        self.requests: queue.Queue = queue.Queue()
+        self.server = socket.create_server((HOST, 0))
+        os.makedirs(os.path.dirname(the_file), exist_ok=True)
+        temp_file = f"{the_file}.{os.getpid()}.tmp"
+        with open(temp_file, 'w', encoding='UTF-8') as file:
+            json.dump({'port': self.server.getsockname()[1],
+                       'token': self.token, 'pid': os.getpid()}, file)
+        os.replace(temp_file, the_file)
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def serve(self) -> None:
+        """Take the puzzles sent until the socket is closed."""
+        while True:
+            try:
+                connection, _ = self.server.accept()
+            except OSError:
+                return
+            with connection:
+                try:
+                    connection.settimeout(TIMEOUT)
+                    with connection.makefile('rb') as reader:
+                        request = json.loads(reader.readline(MAX_MESSAGE))
+                    if request.get('token') != self.token \
+                            or not isinstance(request.get('sides'), list):
+                        continue
+                    self.requests.put([str(side) for side in request['sides']])
+                    connection.sendall(b'ok\n')
+                except (OSError, ValueError, AttributeError):
+                    continue
+
+    def close(self) -> None:
+        """Stop listening, and remove the file if a later copy hasn't
+           taken it over."""
+        self.server.close()
+        instance = read_instance(self.the_file)
+        if instance is not None and instance['token'] == self.token:
+            try:
+                os.remove(self.the_file)
+            except OSError:
+                pass
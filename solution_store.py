@@ -0,0 +1,96 @@
+"""The archive of NYT Letter Boxed solutions, indexed in memory.
+
+Each line of the encrypted solutions file is date*solution*sides*signature.
+The file is decrypted into memory once, never on disk, and new days are
+appended to the end of the file with the same cipher key."""
+import ast
+import os
+import random
+
+from encrypt import iter_decrypted_lines, read_key, shift_line
+
+
+class SolutionStore:
+    """The solutions in a file, looked up by signature or by date."""
+
+    def __init__(self, the_file: str):
+        self.the_file = the_file
+        self.records: list[dict] = []
+        self.by_signature: dict[str, dict] = {}
+        self.by_date: dict[str, dict] = {}
+        if os.path.exists(the_file):
+            for line in iter_decrypted_lines(the_file):
+                self._index(line)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _index(self, line: str) -> dict | None:
+        """Add a line of the file to the indexes."""
+        fields = line.strip().split('*')
+        if len(fields) != 4:
+            return None
+        record = {'date': fields[0],
+                  'solution': ast.literal_eval(fields[1]),
+                  'sides': ast.literal_eval(fields[2]),
+                  'signature': fields[3]}
+        self.records.append(record)
+        self.by_date[record['date']] = record
+        # If a box comes round again, keep the latest day's solution.
+        latest = self.by_signature.get(record['signature'])
+        if latest is None or latest['date'] < record['date']:
+            self.by_signature[record['signature']] = record
+        return record
+
+    def get_solution(self, signature: str, default=None) -> list[str]:
+        """Return NYT's solution for the signature of a box."""
+        record = self.by_signature.get(signature)
+        return default if record is None else record['solution']
+
+    def get(self, letterbox_date: str) -> dict | None:
+        """Return the record for a date."""
+        return self.by_date.get(letterbox_date)
+
+    def _cipher_key(self) -> int | None:
+        """Return the key on the first line of the file, None if the file
+           is not encrypted. A new file is started with a random key."""
+        if not os.path.exists(self.the_file) or \
+                os.path.getsize(self.the_file) == 0:
+            key = random.randint(1, 25)
+            with open(self.the_file, 'w', encoding='UTF-8') as file:
+                file.write(f"{key}\n")
+            return key
+        with open(self.the_file, 'r', encoding='UTF-8') as file:
+            first_line = file.readline()
+        return read_key(first_line)
+
+    def append(self, letterbox_date: str, solution: list[str],
+               sides: list[str], signature: str) -> bool:
+        """Append a day's solution to the end of the file.
+           Return False if the day is already there."""
+        return self.extend([(letterbox_date, solution, sides, signature)]) == 1
+
+    def extend(self, days: list[tuple[str, list[str], list[str], str]]) -> int:
+        """Append the solutions of many days, each as (date, solution,
+           sides, signature), to the file in one write, in date order.
+           Days already there are skipped. Return the number appended."""
+        lines = {}
+        for letterbox_date, solution, sides, signature in days:
+            if letterbox_date not in self.by_date and letterbox_date not in lines:
+                lines[letterbox_date] = \
+                    f"{letterbox_date}*{solution}*{sides}*{signature}\n".lower()
+        if not lines:
+            return 0
+        lines = [lines[letterbox_date] for letterbox_date in sorted(lines)]
+        key = self._cipher_key()
+        with open(self.the_file, 'rb+') as file:
+            file.seek(-1, os.SEEK_END)
+            ends_with_newline = file.read(1) == b'\n'
+        text = ''.join(lines)
+        with open(self.the_file, 'a', encoding='UTF-8') as file:
+            if not ends_with_newline:
+                file.write('\n')
+            file.write(text if key is None else shift_line(text, key))
+        for line in lines:
+            self._index(line)
+        return len(lines)
@@ -0,0 +1,156 @@
+"""The importers against a local HTTP server standing in for the site."""
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import import_backfill
+from import_requests import (extract_game_data, fetch_game_data, make_session,
+                             merge_dated_words)
+from letterboxed_lexicon import file_hash
+from solution_store import SolutionStore
+from word_features import REPEATED, features_path, load_features
+
+
+def game_data(print_date: str, words: list[str]) -> dict:
+    """The game data of a puzzle page."""
+    return {'printDate': print_date, 'dictionary': words,
+            'ourSolution': ['adgj', 'jbehkcfil'],
+            'sides': ['ABC', 'DEF', 'GHI', 'JKL']}
+
+
+def page(data: dict) -> str:
+    """A puzzle page with the game data and more script after it."""
+    return (f'<html><script>window.gameData = {json.dumps(data)};'
+            'window.other = {"a": {"b": 1}};</script></html>')
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Serve the server's pages, failing the first request for each."""
+
+    def log_message(self, *_):
+        pass
+
+    def do_GET(self):
+        hits = self.server.hits
+        hits[self.path] = hits.get(self.path, 0) + 1
+        if self.path not in self.server.pages:
+            self.send_response(404)
+            self.end_headers()
+            return
+        if hits[self.path] == 1:
+            self.send_response(503)
+            self.end_headers()
+            return
+        data = self.server.pages[self.path].encode('UTF-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class LocalSiteTest(unittest.TestCase):
+    """Tests that fetch from the local server."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        self.server.hits = {}
+        self.server.pages = {
+            '/2025-01-01': page(game_data('2025-01-01', ['ADGJ', 'JBEHKCFIL'])),
+            '/2025-01-02': page(game_data('2025-01-02', ['ADGJ', 'GJB'])),
+        }
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def test_retries_server_errors(self):
+        with make_session(retries=2) as session:
+            data = fetch_game_data(self.base + '/2025-01-01', session)
+        self.assertEqual(data['printDate'], '2025-01-01')
+        self.assertEqual(self.server.hits['/2025-01-01'], 2)
+
+    def test_backfill(self):
+        dictionary = os.path.join(self.temp_dir.name, 'daily_dictionaries.txt')
+        solutions = os.path.join(self.temp_dir.name, 'letterboxed_solutions.txt')
+        with open(dictionary, 'w', encoding='UTF-8') as file:
+            file.write("adgj\t2025-01-05\n")
+        status = import_backfill.main(
+            [self.base + '/2025-01-02', self.base + '/2025-01-01',
+             self.base + '/missing', '--dictionary', dictionary,
+             '--solutions', solutions, '--retries', '2'])
+        self.assertEqual(status, 1)  # The missing page.
+        with open(dictionary, 'r', encoding='UTF-8') as file:
+            self.assertEqual(file.read(), "adgj\t2025-01-01\n"
+                                          "gjb\t2025-01-02\n"
+                                          "jbehkcfil\t2025-01-01\n")
+        store = SolutionStore(solutions)
+        self.assertEqual([record['date'] for record in store.records],
+                         ['2025-01-01', '2025-01-02'])
+
+
+class ExtractGameDataTest(unittest.TestCase):
+
+    def test_braces_in_strings(self):
+        data = game_data('2025-01-01', ['ADGJ'])
+        data['note'] = 'a } and a { and "quoted" text'
+        self.assertEqual(extract_game_data(page(data)), data)
+
+    def test_no_game_data(self):
+        with self.assertRaises(ValueError):
+            extract_game_data('<html></html>')
+
+
+class MergeDatedWordsTest(unittest.TestCase):
+
+    def test_keeps_the_earlier_date(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dictionary = os.path.join(temp_dir, 'daily_dictionaries.txt')
+            with open(dictionary, 'w', encoding='UTF-8') as file:
+                file.write("abc\t2025-01-03\nxyz\t2025-01-01\n")
+            counts = merge_dated_words(dictionary, {'abc': '2025-01-02',
+                                                    'xyz': '2025-01-04',
+                                                    'mno': '2025-01-04'})
+            self.assertEqual(counts, (1, 1, 3))
+            with open(dictionary, 'r', encoding='UTF-8') as file:
+                self.assertEqual(file.read(), "abc\t2025-01-02\n"
+                                              "mno\t2025-01-04\n"
+                                              "xyz\t2025-01-01\n")
+
+    def test_writes_the_features(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dictionary = os.path.join(temp_dir, 'daily_dictionaries.txt')
+            with open(dictionary, 'w', encoding='UTF-8') as file:
+                file.write("abc\t2025-01-03\n")
+            merge_dated_words(dictionary, {'abba': '2025-01-04'})
+            features = load_features(features_path(dictionary),
+                                     file_hash(dictionary).hex())
+            self.assertEqual(features.words, ['abba', 'abc'])
+            self.assertEqual(list(features.masks), [0b11, 0b111])
+            self.assertEqual(list(features.flags), [REPEATED, 0])
+
+    def test_features_that_cant_be_written(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dictionary = os.path.join(temp_dir, 'daily_dictionaries.txt')
+            with open(dictionary, 'w', encoding='UTF-8') as file:
+                file.write("abc\t2025-01-03\n")
+            # A directory where the features file goes can't be replaced.
+            os.makedirs(os.path.join(features_path(dictionary), 'blocked'))
+            with redirect_stderr(io.StringIO()) as errors:
+                counts = merge_dated_words(dictionary, {'abd': '2025-01-04'})
+            self.assertEqual(counts, (1, 0, 2))
+            self.assertIn("Could not write the word features", errors.getvalue())
+            with open(dictionary, 'r', encoding='UTF-8') as file:
+                self.assertEqual(file.read(), "abc\t2025-01-03\nabd\t2025-01-04\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""The ranked search for solutions against a brute-force ranking."""
+import unittest
+from itertools import permutations
+
+from letterboxed import iter_solutions, solution_rank
+
+LETTERS = set('abcdefghijkl')
+WORDS = ['abcdefg', 'ghijkl',        # Two words.
+         'abcdef', 'fghijkl',        # Two longer words.
+         'abcd', 'defgh', 'hijkl',   # Three words.
+         'abc', 'cdefg', 'gijkl', 'lh',
+         'adgj', 'jbehkcfil', 'lkh']
+
+
+def ranked_chains(words: list[str], max_words: int) -> list[tuple[str, ...]]:
+    """Every chain of up to max_words different words that uses all the
+       letters, in ranked order."""
+    chains = [chain for count in range(1, max_words + 1)
+              for chain in permutations(words, count)
+              if all(before[-1] == after[0]
+                     for before, after in zip(chain, chain[1:]))
+              and set(''.join(chain)) == LETTERS]
+    return sorted(chains, key=solution_rank)
+
+
+class IterSolutionsTest(unittest.TestCase):
+
+    def test_limit_past_the_shortest_chains(self):
+        expected = ranked_chains(WORDS, 3)
+        two_words = sum(1 for chain in expected if len(chain) == 2)
+        limit = two_words + 3
+        self.assertLess(limit, len(expected))
+        found = list(iter_solutions(WORDS, limit=limit))
+        self.assertEqual(found, expected[:limit])
+        self.assertEqual({len(chain) for chain in found}, {2, 3})
+
+    def test_without_a_limit(self):
+        expected = ranked_chains(WORDS, 3)
+        self.assertEqual(list(iter_solutions(WORDS)),
+                         [chain for chain in expected if len(chain) == 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""The solve server on a free port, with a small dictionary."""
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+import letterboxed_server
+from letterboxed_server import make_server
+
+SIDES = ['abc', 'def', 'ghi', 'jkl']
+WORDS = "adgj\t2025-01-01\njbehkcfil\t2025-01-01\n"
+
+
+class SolveServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dictionary = os.path.join(self.temp_dir.name, 'daily_dictionaries.txt')
+        with open(self.dictionary, 'w', encoding='UTF-8') as file:
+            file.write(WORDS)
+        # The lexicon is compiled into the temp directory too.
+        self.server = make_server(port=0, the_file=self.dictionary, cache_size=2,
+                                  cache_dir=self.temp_dir.name)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def get(self, path: str) -> tuple[int, dict]:
+        """The status and JSON reply of a GET."""
+        try:
+            with urllib.request.urlopen(self.base + path) as reply:
+                return reply.status, json.load(reply)
+        except urllib.error.HTTPError as e:
+            return e.code, json.load(e)
+
+    def test_port_zero_picks_a_free_port(self):
+        self.assertNotEqual(self.server.server_address[1], 0)
+
+    def test_get_and_cache(self):
+        status, reply = self.get('/solve?sides=abc,def,ghi,jkl')
+        self.assertEqual(status, 200)
+        self.assertEqual(reply['words'], ['adgj', 'jbehkcfil'])
+        self.assertEqual(reply['best'], ['adgj', 'jbehkcfil'])
+        self.assertFalse(reply['cached'])
+        # The sides are checked in lower case, so this is the same box.
+        self.assertTrue(self.get('/solve?sides=ABC,def,ghi,jkl')[1]['cached'])
+
+    def test_post(self):
+        request = urllib.request.Request(
+            self.base + '/solve', data=json.dumps({'sides': SIDES}).encode(),
+            method='POST')
+        with urllib.request.urlopen(request) as reply:
+            self.assertEqual(json.load(reply)['best'], ['adgj', 'jbehkcfil'])
+
+    def test_errors(self):
+        self.assertEqual(self.get('/solve?sides=abc')[0], 400)
+        self.assertEqual(self.get('/nowhere')[0], 404)
+
+    def test_reloads_a_changed_dictionary(self):
+        self.get('/solve?sides=abc,def,ghi,jkl')
+        time.sleep(letterboxed_server.CHECK_INTERVAL + 0.1)
+        with open(self.dictionary, 'a', encoding='UTF-8') as file:
+            file.write("adgjbehkcfil\t2025-01-02\n")
+        status, reply = self.get('/solve?sides=abc,def,ghi,jkl')
+        self.assertFalse(reply['cached'])
+        self.assertEqual(reply['best'], ['adgjbehkcfil'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""The NumPy word search gives the same words as the trie search."""
+import os
+import tempfile
+import unittest
+
+from letterboxed import Solver
+from letterboxed_lexicon import Trie, load_lexicon, load_words
+from solution_store import SolutionStore
+
+try:
+    from letterboxed_vector import EncodedWords, find_words
+except ImportError:  # NumPy is not installed.
+    EncodedWords = None
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DICTIONARY = os.path.join(REPO, 'daily_dictionaries.txt')
+SOLUTIONS = os.path.join(REPO, 'letterboxed_solutions.txt')
+BOXES = 12  # Archive boxes checked.
+
+
+@unittest.skipIf(EncodedWords is None, "NumPy is not installed")
+class VectorSearchTest(unittest.TestCase):
+
+    def test_synthetic_box(self):
+        box = ['abc', 'def', 'ghi', 'jkl']
+        words = ['adgj',          # One letter from each side.
+                 'ab',            # Both letters on one side.
+                 'adz',           # A letter not in the box.
+                 'jbehkcfil',     # All but three of the letters.
+                 'a',             # A single letter.
+                 'adgjbehkcfil',  # The longest, so no padding.
+                 'dad', 'gig']
+        expected = set(Solver(Trie(words)).find_words(box))
+        self.assertEqual(expected, {'adgj', 'jbehkcfil', 'adgjbehkcfil', 'dad'})
+        self.assertEqual(set(find_words(box, EncodedWords(words))), expected)
+
+    @unittest.skipUnless(os.path.exists(DICTIONARY) and os.path.exists(SOLUTIONS),
+                         "the archive is not here")
+    def test_archive_boxes(self):
+        encoded = EncodedWords(load_words(DICTIONARY))
+        boxes = [record['sides'] for record in SolutionStore(SOLUTIONS).records]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            lexicon = load_lexicon(DICTIONARY, cache_dir)
+            solver = Solver(lexicon)
+            for box in boxes[:BOXES]:
+                with self.subTest(box=box):
+                    self.assertEqual(set(find_words(box, encoded)),
+                                     set(solver.find_words(box)))
+            lexicon.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
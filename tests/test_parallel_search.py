@@ -0,0 +1,49 @@
+"""The words found on a pool of processes are the ones found on one."""
+import os
+import tempfile
+import unittest
+
+from letterboxed import Solver, SolveStats
+from parallel_search import ParallelSolver
+from solution_store import SolutionStore
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DICTIONARY = os.path.join(REPO, 'daily_dictionaries.txt')
+SOLUTIONS = os.path.join(REPO, 'letterboxed_solutions.txt')
+BOXES = 4  # Archive boxes checked.
+
+
+@unittest.skipUnless(os.path.exists(DICTIONARY) and os.path.exists(SOLUTIONS),
+                     "the archive is not here")
+class ParallelSolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.solver = ParallelSolver(DICTIONARY, workers=2,
+                                     cache_dir=self.temp_dir.name)
+
+    def tearDown(self):
+        self.solver.close()
+        self.solver.lexicon.close()
+        self.temp_dir.cleanup()
+
+    def test_same_words_in_the_same_order(self):
+        one_process = Solver(self.solver.lexicon)
+        boxes = [record['sides'] for record in SolutionStore(SOLUTIONS).records]
+        for box in boxes[:BOXES]:
+            with self.subTest(box=box):
+                self.assertEqual(self.solver.find_words(box),
+                                 one_process.find_words(box))
+
+    def test_starts_and_stats(self):
+        box = SolutionStore(SOLUTIONS).records[0]['sides']
+        stats = SolveStats()
+        words = self.solver.find_words(box, stats, starts=box[0])
+        self.assertEqual(words, Solver(self.solver.lexicon).find_words(
+            box, starts=box[0]))
+        self.assertTrue(all(word[0] in box[0] for word in words))
+        self.assertGreater(stats.nodes_expanded, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
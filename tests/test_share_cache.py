@@ -0,0 +1,100 @@
+"""ShareCache with a temp directory standing in for the share."""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from share_cache import ShareCache
+
+
+class SlowShareCache(ShareCache):
+    """A share that takes a while to answer."""
+    delay = 0.5
+
+    def refresh(self, share_file: str) -> bool:
+        time.sleep(self.delay)
+        return super().refresh(share_file)
+
+
+class ShareCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.share = os.path.join(self.temp_dir.name, 'share')
+        os.makedirs(self.share)
+        self.share_file = os.path.join(self.share, 'daily_dictionaries.txt')
+        self.write("abc\t2025-01-01\n")
+        self.cache = ShareCache(os.path.join(self.temp_dir.name, 'cache'))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, text: str) -> None:
+        """Change the file on the share."""
+        with open(self.share_file, 'w', encoding='UTF-8') as file:
+            file.write(text)
+
+    def read(self, the_file: str) -> str:
+        with open(the_file, 'r', encoding='UTF-8') as file:
+            return file.read()
+
+    def test_first_fetch_copies(self):
+        local_file = self.cache.fetch(self.share_file)
+        self.assertNotEqual(local_file, self.share_file)
+        self.assertEqual(self.read(local_file), "abc\t2025-01-01\n")
+
+    def test_unchanged(self):
+        local_file = self.cache.fetch(self.share_file)
+        mtime = os.stat(local_file).st_mtime_ns
+        self.assertFalse(self.cache.refresh(self.share_file))
+        self.assertEqual(os.stat(local_file).st_mtime_ns, mtime)
+
+    def test_touched_only(self):
+        local_file = self.cache.fetch(self.share_file)
+        mtime = os.stat(local_file).st_mtime_ns
+        later = os.stat(self.share_file).st_mtime_ns + 10 ** 9
+        os.utime(self.share_file, ns=(later, later))
+        self.assertFalse(self.cache.refresh(self.share_file))
+        # The copy is left alone, and the new mtime recorded.
+        self.assertEqual(os.stat(local_file).st_mtime_ns, mtime)
+        self.assertEqual(self.cache.stamp(self.share_file)['mtime_ns'], later)
+
+    def test_changed(self):
+        local_file = self.cache.fetch(self.share_file)
+        self.write("abc\t2025-01-01\nabd\t2025-01-02\n")
+        self.assertEqual(self.read(self.cache.fetch(self.share_file)),
+                         "abc\t2025-01-01\nabd\t2025-01-02\n")
+        self.assertEqual(self.cache.fetch(self.share_file), local_file)
+
+    def test_unreachable(self):
+        local_file = self.cache.fetch(self.share_file)
+        shutil.rmtree(self.share)
+        self.assertEqual(self.cache.fetch(self.share_file), local_file)
+        self.assertEqual(self.read(local_file), "abc\t2025-01-01\n")
+
+    def test_unreachable_with_no_copy(self):
+        shutil.rmtree(self.share)
+        with self.assertRaises(OSError):
+            self.cache.fetch(self.share_file)
+
+    def test_slow_share_uses_the_copy(self):
+        cache = SlowShareCache(self.cache.cache_dir)
+        local_file = self.cache.fetch(self.share_file)
+        self.write("abd\t2025-01-02\n")
+        start = time.monotonic()
+        self.assertEqual(cache.fetch(self.share_file, timeout=0.05), local_file)
+        self.assertLess(time.monotonic() - start, cache.delay)
+        self.assertEqual(self.read(local_file), "abc\t2025-01-01\n")
+        # The refresh goes on and the copy is up to date after it.
+        cache.start(self.share_file).join()
+        self.assertEqual(self.read(local_file), "abd\t2025-01-02\n")
+
+    def test_slow_share_with_no_copy_is_waited_for(self):
+        cache = SlowShareCache(self.cache.cache_dir)
+        local_file = cache.fetch(self.share_file, timeout=0.05)
+        self.assertEqual(self.read(local_file), "abc\t2025-01-01\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Features of each dictionary word, worked out once when it is imported.
+
+The features file sits beside the dictionary, as daily_dictionaries.features
+beside daily_dictionaries.txt, with an entry for each word in the same
+order. The entries are held as columns: a 26-bit mask of the letters a to
+z, the number of different letters, the first and last letters, the
+length and flags. A word with a letter twice in a row can never be played,
+nor one with anything but a to z in it, so either sets a flag. The header
+has the size and sha256 of the dictionary the file was made from, so a
+stale file is never used. The importer writes the file as it merges the
+words, and the solvers can then drop words with a mask test instead of
+looking at their letters."""
+import os
+import struct
+from array import array
+
+# magic, version, source size, source sha256, word count.
+HEADER = struct.Struct('<4sIQ32sI')
+MAGIC = b'LBWF'
+VERSION = 1
+
+REPEATED = 1  # A letter twice in a row.
+NOT_AZ = 2    # A character other than a to z.
+
+
+def features_path(dictionary_file: str) -> str:
+    """The features file beside a dictionary file."""
+    return os.path.splitext(dictionary_file)[0] + '.features'
+
+
+def word_features(word: str) -> tuple[int, int, int, int, int, int]:
+    """The mask, different letter count, first and last letters, length
+       and flags of a word. The letters are as their character codes."""
+    mask = 0
+    flags = 0
+    for letter in word:
+        if 'a' <= letter <= 'z':
+            mask |= 1 << (ord(letter) - ord('a'))
+        else:
+            flags |= NOT_AZ
+    if any(a == b for a, b in zip(word, word[1:])):
+        flags |= REPEATED
+    first = ord(word[0]) if word else 0
+    last = ord(word[-1]) if word else 0
+    return (mask, mask.bit_count(), min(first, 255), min(last, 255),
+            min(len(word), 255), flags)
+
+
+def write_features(the_file: str, words: list[str],
+                   stamp: tuple[int, bytes]) -> None:
+    """Write the features of the words. The stamp is the size and hash
+       of the dictionary they are from."""
+    masks = array('I')
+    columns = [bytearray() for _ in range(5)]
+    for word in words:
+        mask, *small = word_features(word)
+        masks.append(mask)
+        for column, value in zip(columns, small):
+            column.append(value)
+    blob = bytearray(HEADER.pack(MAGIC, VERSION, *stamp, len(words)))
+    blob += masks.tobytes()
+    for column in columns:
+        blob += column
+    blob += '\n'.join(words).encode('UTF-8')
+    temp_file = f"{the_file}.{os.getpid()}.tmp"
+    try:
+        with open(temp_file, 'wb') as file:
+            file.write(blob)
+        os.replace(temp_file, the_file)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+class WordFeatures:
+    """The features in a features file, a column for each."""
+
+    def __init__(self, the_file: str):
+        # Read whole rather than mapped, so the file isn't held open.
+        with open(the_file, 'rb') as file:
+            data = file.read()
+        magic, version, self.source_size, self.source_hash, count = \
+            HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{the_file} is not a version {VERSION} features file")
+        self.version = self.source_hash.hex()
+        view = memoryview(data)
+        start = HEADER.size
+        self.masks = view[start:start + 4 * count].cast('I')
+        start += 4 * count
+        (self.distinct, self.first, self.last, self.lengths, self.flags) = (
+            view[start + i * count:start + (i + 1) * count] for i in range(5))
+        self.words = bytes(view[start + 5 * count:]).decode('UTF-8').split('\n') \
+            if count else []
+        if len(self.words) != count or len(self.masks) != count:
+            raise ValueError(f"{the_file} is cut short")
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def playable(self, max_letters: int) -> list[int]:
+        """The indexes of the words that could be in a box of max_letters
+           letters: two or more letters, all a to z, no more different
+           letters than the box has and none twice in a row."""
+        lengths, flags, distinct = self.lengths, self.flags, self.distinct
+        return [i for i in range(len(self.words))
+                if lengths[i] > 1 and not flags[i] and distinct[i] <= max_letters]
+
+
+def load_features(the_file: str, version: str | None) -> WordFeatures | None:
+    """The features in the file if it was made from the dictionary with the
+       version, the hex sha256 of the dictionary as a compiled lexicon has
+       it. None if not, or if the file can't be read."""
+    if version is None:
+        return None
+    try:
+        features = WordFeatures(the_file)
+    except (OSError, ValueError, struct.error):
+        return None
+    return features if features.version == version else None